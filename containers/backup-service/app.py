@@ -6,13 +6,25 @@ Integrates with Rosenpass for quantum-resistant data protection
 
 import os
 import sys
+import fcntl
 import json
 import time
+import base64
 import logging
+import itertools
+import functools
+import struct
 import asyncio
+import queue
+import tempfile
+import threading
+import contextlib
+import orjson
+import aiofiles
 from pathlib import Path
+from collections import OrderedDict
 from datetime import datetime
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from typing import Dict, Any
 
 # Handle ECS DB_CREDENTIALS environment variable
@@ -37,6 +49,89 @@ except ImportError:
     print("⚠️  Quantum modules not available, using fallback encryption")
     QUANTUM_AVAILABLE = False
 
+# Process-wide Rosenpass connector, handshaken once per worker. Flask runs each
+# async view on its own short-lived loop, so the connector lives on a dedicated
+# loop thread instead; schedule connector coroutines there with run_coroutine_threadsafe
+_rosenpass_connector = None
+_rosenpass_loop = None
+_rosenpass_lock = threading.Lock()
+
+def _shared_rosenpass_connector():
+    """Return the process-wide Rosenpass connector, initializing it on first use"""
+    global _rosenpass_connector, _rosenpass_loop
+    if _rosenpass_connector is None:
+        with _rosenpass_lock:
+            if _rosenpass_connector is None:
+                if _rosenpass_loop is None:
+                    _rosenpass_loop = asyncio.new_event_loop()
+                    threading.Thread(target=_rosenpass_loop.run_forever,
+                                     name='rosenpass-loop', daemon=True).start()
+                connector = RosenpassConnector(
+                    config_dir='/app/rosenpass/config',
+                    key_dir='/app/rosenpass/keys',
+                    socket_path='/var/run/rosenpass/rosenpass.sock'
+                )
+                asyncio.run_coroutine_threadsafe(connector.initialize(), _rosenpass_loop).result()
+                _rosenpass_connector = connector
+    return _rosenpass_connector
+
+@functools.lru_cache(maxsize=None)
+def _shared_quantum_crypto():
+    """Process-wide QuantumCrypto so its key schedule is set up only once"""
+    return QuantumCrypto()
+
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# zstd contexts are reused rather than rebuilt per backup. They are not thread-safe,
+# and Flask runs each async view on a fresh thread (so a threading.local would never
+# be reused); instead each call borrows a context exclusively from a shared pool
+_zstd_compressors = queue.SimpleQueue()
+_zstd_decompressors = queue.SimpleQueue()
+
+@contextlib.contextmanager
+def _borrow_zstd(pool, factory):
+    """Borrow a zstd context from pool, creating one when all are in use"""
+    try:
+        context = pool.get_nowait()
+    except queue.Empty:
+        context = factory()
+    try:
+        yield context
+    finally:
+        pool.put(context)
+
+# Faster event loop for Rosenpass socket and async file I/O
+try:
+    import uringcore
+    asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+except ImportError:
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+# Backup file framing: magic + metadata length, then metadata JSON, then ciphertext
+_BACKUP_MAGIC = b'KSB1'
+_BACKUP_HEADER = struct.Struct('>4sI')
+
+# Batch restore limits: larger requests are rejected, and at most
+# RESTORE_CONCURRENCY backups are read and decrypted at once
+RESTORE_BATCH_MAX = int(os.environ.get('RESTORE_BATCH_MAX', '50'))
+RESTORE_CONCURRENCY = int(os.environ.get('RESTORE_CONCURRENCY', '8'))
+
+# Parsed backup headers kept in memory (LRU, so deleted backups age out)
+METADATA_CACHE_SIZE = int(os.environ.get('METADATA_CACHE_SIZE', '4096'))
+
+# Compact JSON (de)serializers for backup payloads and metadata, bound
+# directly so hot paths skip a wrapper frame and attribute lookup
+_dumps = orjson.dumps
+_loads = orjson.loads
+
 class QuantumBackupService:
     """Quantum-protected backup service with Rosenpass integration"""
     
@@ -52,10 +147,28 @@ class QuantumBackupService:
         self.backup_dir = Path('/app/backups')
         self.config_dir = Path('/app/rosenpass/config')
         
+        # Parsed backup metadata keyed by path, invalidated on mtime change
+        self._meta_cache: OrderedDict = OrderedDict()
+        self._meta_cache_lock = threading.Lock()
+        
+        # Client backup directories already known to exist
+        self._known_dirs: set = set()
+        
         # Ensure directories exist
         self.backup_dir.mkdir(parents=True, exist_ok=True)
         self.config_dir.mkdir(parents=True, exist_ok=True)
         
+        # Client backup configurations, persisted so they survive restarts
+        # shared by every gunicorn worker, so writes are serialized with a thread lock plus flock
+        self.client_state_file = self.backup_dir / 'clients.json'
+        self._client_state_lock_file = self.backup_dir / 'clients.lock'
+        self._state_lock = threading.Lock()
+        self._state_mtime_ns = None
+        self._client_configs, self._client_status = self._load_client_state()
+        
+        # Monotonic backup IDs, continuing after any existing backups
+        self._id_counter = itertools.count(self._scan_max_existing_id() + 1)
+        
         # Setup Flask routes
         self._setup_routes()
         
@@ -69,313 +182,555 @@ class QuantumBackupService:
         )
         return logging.getLogger(__name__)
     
-    async def initialize_quantum_protection(self):
+    def initialize_quantum_protection(self):
         """Initialize quantum protection components"""
         try:
             if not QUANTUM_AVAILABLE:
                 self.logger.warning("⚠️  Quantum protection not available, using fallback")
                 return False
             
-            # Initialize Rosenpass connector
-            self.rosenpass = RosenpassConnector(
-                config_dir='/app/rosenpass/config',
-                key_dir='/app/rosenpass/keys',
-                socket_path='/var/run/rosenpass/rosenpass.sock'
-            )
-            
-            await self.rosenpass.initialize()
+            # Initialize Rosenpass connector (reused if this worker already connected)
+            self.rosenpass = _shared_rosenpass_connector()
             
             # Initialize quantum crypto
-            self.quantum_crypto = QuantumCrypto()
+            self.quantum_crypto = _shared_quantum_crypto()
             
             self.logger.info("✅ Quantum protection initialized for backup service")
             return True
             
         except Exception as e:
-            self.logger.error(f"❌ Failed to initialize quantum protection: {e}")
+            self.logger.error("❌ Failed to initialize quantum protection: %s", e)
             return False
     
     def _setup_routes(self):
         """Setup Flask API routes"""
-        
-        @self.app.route('/health', methods=['GET'])
-        def health_check():
-            """Health check endpoint with quantum crypto status"""
+        self.app.add_url_rule('/health', view_func=self._route_health_check, methods=['GET'])
+        self.app.add_url_rule('/api/backup/create', view_func=self._route_create_backup, methods=['POST'])
+        self.app.add_url_rule('/api/backup/restore', view_func=self._route_restore_backup, methods=['POST'])
+        self.app.add_url_rule('/api/backup/restore_batch', view_func=self._route_restore_backup_batch, methods=['POST'])
+        self.app.add_url_rule('/api/backup/list', view_func=self._route_list_backups, methods=['GET'])
+        self.app.add_url_rule('/api/backup/inspect/<backup_id>', view_func=self._route_inspect_backup, methods=['GET'])
+        self.app.add_url_rule('/api/quantum/status', view_func=self._route_quantum_status, methods=['GET'])
+
+        # ============= CLIENT BACKUP MANAGEMENT APIs =============
+        self.app.add_url_rule('/admin/clients/<client_id>/backup/initialize', view_func=self._route_initialize_client_backup, methods=['POST'])
+        self.app.add_url_rule('/admin/clients/<client_id>/backup/status', view_func=self._route_get_client_backup_status, methods=['GET'])
+        self.app.add_url_rule('/admin/clients/<client_id>/backup/trigger', view_func=self._route_trigger_client_backup, methods=['POST'])
+    
+    def _route_health_check(self):
+        """Health check endpoint with quantum crypto status"""
+        return jsonify({
+            'status': 'healthy',
+            'service': 'quantum-backup',
+            'algorithm': 'ChaCha20-Poly1305',
+            'real_quantum_crypto': QUANTUM_AVAILABLE,
+            'quantum_library': 'liboqs-python + pycryptodome' if QUANTUM_AVAILABLE else 'fallback',
+            'rosenpass_tunnel': QUANTUM_AVAILABLE and self.rosenpass is not None,
+            'backups_created': getattr(self, 'backup_counter', 0),
+            'timestamp': datetime.now().isoformat()
+        })
+    
+    async def _route_create_backup(self):
+        """Create quantum-protected backup"""
+        try:
+            data = request.get_json()
+            backup_name = data.get('name', f'backup_{int(time.time())}')
+            source_data = data.get('data', {})
+            
+            # Create backup with quantum protection
+            backup_result = await self._create_quantum_backup(backup_name, source_data)
+            
             return jsonify({
-                'status': 'healthy',
-                'service': 'quantum-backup',
-                'algorithm': 'ChaCha20-Poly1305',
-                'real_quantum_crypto': QUANTUM_AVAILABLE,
-                'quantum_library': 'liboqs-python + pycryptodome' if QUANTUM_AVAILABLE else 'fallback',
-                'rosenpass_tunnel': QUANTUM_AVAILABLE and self.rosenpass is not None,
-                'backups_created': getattr(self, 'backup_counter', 0),
-                'timestamp': datetime.now().isoformat()
+                'success': True,
+                'backup_id': backup_result['backup_id'],
+                'quantum_protected': backup_result['quantum_protected'],
+                'timestamp': backup_result['timestamp']
             })
-        
-        @self.app.route('/api/backup/create', methods=['POST'])
-        def create_backup():
-            """Create quantum-protected backup"""
-            try:
-                data = request.get_json()
-                backup_name = data.get('name', f'backup_{int(time.time())}')
-                source_data = data.get('data', {})
-                
-                # Create backup with quantum protection
-                backup_result = self._create_quantum_backup(backup_name, source_data)
-                
-                return jsonify({
-                    'success': True,
-                    'backup_id': backup_result['backup_id'],
-                    'quantum_protected': backup_result['quantum_protected'],
-                    'timestamp': backup_result['timestamp']
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Backup creation error: {e}")
-                return jsonify({'error': str(e)}), 500
-        
-        @self.app.route('/api/backup/restore', methods=['POST'])
-        def restore_backup():
-            """Restore quantum-protected backup"""
-            try:
-                data = request.get_json()
-                backup_id = data.get('backup_id')
-                
-                if not backup_id:
-                    return jsonify({'error': 'backup_id required'}), 400
-                
-                # Restore backup with quantum verification
-                restore_result = self._restore_quantum_backup(backup_id)
-                
-                return jsonify({
-                    'success': True,
-                    'data': restore_result['data'],
-                    'quantum_verified': restore_result['quantum_verified'],
-                    'restored_at': restore_result['restored_at']
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Backup restore error: {e}")
-                return jsonify({'error': str(e)}), 500
-        
-        @self.app.route('/api/backup/list', methods=['GET'])
-        def list_backups():
-            """List available backups"""
-            try:
-                backups = []
-                
-                for backup_file in self.backup_dir.glob('*.backup'):
-                    try:
-                        # Read backup metadata
-                        with open(backup_file.with_suffix('.meta'), 'r') as f:
-                            metadata = json.load(f)
-                        
-                        backups.append({
-                            'backup_id': metadata['backup_id'],
-                            'name': metadata['name'],
-                            'created_at': metadata['created_at'],
-                            'quantum_protected': metadata.get('quantum_protected', False),
-                            'size_bytes': backup_file.stat().st_size
-                        })
-                    except Exception as e:
-                        self.logger.warning(f"Failed to read backup metadata: {e}")
-                
-                return jsonify({
-                    'success': True,
-                    'backups': backups,
-                    'total_count': len(backups)
+            
+        except Exception as e:
+            self.logger.error("Backup creation error: %s", e)
+            return jsonify({'error': str(e)}), 500
+    
+    async def _route_restore_backup(self):
+        """Restore quantum-protected backup"""
+        try:
+            data = request.get_json()
+            backup_id = data.get('backup_id')
+            
+            if not backup_id:
+                return jsonify({'error': 'backup_id required'}), 400
+            
+            # Restore backup with quantum verification
+            raw = request.args.get('raw', '').lower() in ('1', 'true')
+            restore_result = await self._restore_quantum_backup(backup_id, parse=not raw)
+            
+            if raw:
+                # Stored payload is already canonical JSON, return it without a parse/re-encode pass
+                return Response(restore_result['data'], mimetype='application/json', headers={
+                    'X-Quantum-Verified': str(restore_result['quantum_verified']).lower(),
+                    'X-Restored-At': restore_result['restored_at']
                 })
-                
-            except Exception as e:
-                self.logger.error(f"List backups error: {e}")
-                return jsonify({'error': str(e)}), 500
-        
-        @self.app.route('/api/quantum/status', methods=['GET'])
-        def quantum_status():
-            """Get quantum protection status"""
+            
             return jsonify({
-                'quantum_available': QUANTUM_AVAILABLE,
-                'rosenpass_initialized': self.rosenpass is not None,
-                'quantum_crypto_initialized': self.quantum_crypto is not None,
-                'backup_dir': str(self.backup_dir),
-                'config_dir': str(self.config_dir)
+                'success': True,
+                'data': restore_result['data'],
+                'quantum_verified': restore_result['quantum_verified'],
+                'restored_at': restore_result['restored_at']
             })
+            
+        except Exception as e:
+            self.logger.error("Backup restore error: %s", e)
+            return jsonify({'error': str(e)}), 500
+    
+    async def _route_restore_backup_batch(self):
+        """Restore several quantum-protected backups in one request"""
+        try:
+            data = request.get_json(silent=True)
+            backup_ids = data.get('backup_ids') if isinstance(data, dict) else None
+            
+            if not isinstance(backup_ids, list) or not backup_ids:
+                return jsonify({'error': 'backup_ids list required'}), 400
+            if len(backup_ids) > RESTORE_BATCH_MAX:
+                return jsonify({'error': f'At most {RESTORE_BATCH_MAX} backup_ids per batch'}), 400
+            
+            # Overlap file reads and decryption across the batch, a bounded number at a time
+            semaphore = asyncio.Semaphore(RESTORE_CONCURRENCY)
+            
+            async def restore(backup_id):
+                async with semaphore:
+                    return await self._restore_quantum_backup(backup_id)
+            
+            restore_results = await asyncio.gather(
+                *(restore(backup_id) for backup_id in backup_ids),
+                return_exceptions=True
+            )
+            
+            results = []
+            for backup_id, restore_result in zip(backup_ids, restore_results):
+                if isinstance(restore_result, Exception):
+                    results.append({'backup_id': backup_id, 'success': False, 'error': str(restore_result)})
+                else:
+                    results.append({
+                        'backup_id': backup_id,
+                        'success': True,
+                        'data': restore_result['data'],
+                        'quantum_verified': restore_result['quantum_verified'],
+                        'restored_at': restore_result['restored_at']
+                    })
+            
+            return jsonify({
+                'success': all(r['success'] for r in results),
+                'results': results
+            })
+            
+        except Exception as e:
+            self.logger.error("Batch backup restore error: %s", e)
+            return jsonify({'error': str(e)}), 500
+    
+    def _route_list_backups(self):
+        """List available backups"""
+        try:
+            backups = []
+            append = backups.append
+            backup_summary = self._backup_summary
+            
+            with os.scandir(self.backup_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith('.backup'):
+                        continue
+                    try:
+                        # Read backup metadata from the file header
+                        st = entry.stat()
+                        if not st.st_size:
+                            # ID reserved, backup still being written
+                            continue
+                        append(backup_summary(Path(entry.path), st))
+                    except Exception as e:
+                        self.logger.warning("Failed to read backup metadata: %s", e)
+            
+            # Fixed-shape entries serialize in one orjson pass rather than through jsonify
+            return Response(_dumps({
+                'success': True,
+                'backups': backups,
+                'total_count': len(backups)
+            }), mimetype='application/json')
+            
+        except Exception as e:
+            self.logger.error("List backups error: %s", e)
+            return jsonify({'error': str(e)}), 500
+    
+    def _route_inspect_backup(self, backup_id):
+        """Return backup metadata re-indented for human reading"""
+        try:
+            backup_file = self.backup_dir / f"{backup_id}.backup"
+            if not backup_file.exists():
+                return jsonify({'error': f'Backup {backup_id} not found'}), 404
+            
+            metadata, _ = self._load_metadata(backup_file)
+            return Response(
+                orjson.dumps(metadata, option=orjson.OPT_INDENT_2),
+                mimetype='application/json'
+            )
+            
+        except Exception as e:
+            self.logger.error("Backup inspect error: %s", e)
+            return jsonify({'error': str(e)}), 500
+    
+    def _route_quantum_status(self):
+        """Get quantum protection status"""
+        return jsonify({
+            'quantum_available': QUANTUM_AVAILABLE,
+            'rosenpass_initialized': self.rosenpass is not None,
+            'quantum_crypto_initialized': self.quantum_crypto is not None,
+            'backup_dir': str(self.backup_dir),
+            'config_dir': str(self.config_dir)
+        })
+    
+    # ============= CLIENT BACKUP MANAGEMENT APIs =============
 
-        # ============= CLIENT BACKUP MANAGEMENT APIs =============
-
-        # In-memory client backup configurations (replace with database in production)
-        client_backup_configs = {}
-        client_backup_status = {}
-
-        @self.app.route('/admin/clients/<client_id>/backup/initialize', methods=['POST'])
-        def initialize_client_backup(client_id):
-            """Setup backup service for a specific client"""
-            try:
-                data = request.get_json()
-                backup_schedule = data.get('backup_schedule', 'daily')
-                retention_days = data.get('retention_days', 30)
-                encryption_level = data.get('encryption_level', 'quantum')
-                
-                # Initialize client backup configuration
-                client_config = {
-                    'client_id': client_id,
-                    'backup_schedule': backup_schedule,
-                    'retention_days': retention_days,
-                    'encryption_level': encryption_level,
-                    'quantum_protected': QUANTUM_AVAILABLE and encryption_level == 'quantum',
-                    'backup_directory': str(self.backup_dir / client_id),
-                    'initialized_at': datetime.now().isoformat(),
-                    'status': 'active'
-                }
-                
-                # Create client-specific backup directory
-                client_backup_dir = self.backup_dir / client_id
-                client_backup_dir.mkdir(exist_ok=True)
-                
-                # Store configuration
-                client_backup_configs[client_id] = client_config
-                client_backup_status[client_id] = {
+    def _route_initialize_client_backup(self, client_id):
+        """Setup backup service for a specific client"""
+        try:
+            data = request.get_json()
+            backup_schedule = data.get('backup_schedule', 'daily')
+            retention_days = data.get('retention_days', 30)
+            encryption_level = data.get('encryption_level', 'quantum')
+            
+            # Initialize client backup configuration
+            client_config = {
+                'client_id': client_id,
+                'backup_schedule': backup_schedule,
+                'retention_days': retention_days,
+                'encryption_level': encryption_level,
+                'quantum_protected': QUANTUM_AVAILABLE and encryption_level == 'quantum',
+                'backup_directory': str(self.backup_dir / client_id),
+                'initialized_at': datetime.now().isoformat(),
+                'status': 'active'
+            }
+            
+            # Create client-specific backup directory
+            self._ensure_client_dir(client_id)
+            
+            # Store configuration
+            with self._client_state_update():
+                self._client_configs[client_id] = client_config
+                self._client_status[client_id] = {
                     'last_backup': None,
                     'backup_count': 0,
                     'total_size': 0,
                     'status': 'initialized',
                     'next_scheduled': None
                 }
-                
-                self.logger.info(f"💾 Initialized backup service for client {client_id}")
-                return jsonify({
-                    'client_id': client_id,
-                    'status': 'initialized',
-                    'quantum_protected': client_config['quantum_protected'],
-                    'backup_schedule': backup_schedule
-                }), 201
-                
-            except Exception as e:
-                self.logger.error(f"❌ Failed to initialize backup for {client_id}: {e}")
-                return jsonify({'error': str(e)}), 500
-
-        @self.app.route('/admin/clients/<client_id>/backup/status', methods=['GET'])
-        def get_client_backup_status(client_id):
-            """Get backup status for a specific client"""
-            try:
-                if client_id not in client_backup_configs:
-                    return jsonify({'error': 'Client backup not configured'}), 404
-                
-                config = client_backup_configs[client_id]
-                status = client_backup_status[client_id]
-                
-                # Count client's backup files
-                client_backup_dir = self.backup_dir / client_id
-                backup_files = list(client_backup_dir.glob('*.backup')) if client_backup_dir.exists() else []
-                
-                # Calculate total size
-                total_size = sum(f.stat().st_size for f in backup_files)
-                
-                return jsonify({
-                    'client_id': client_id,
-                    'backup_config': config,
-                    'backup_status': {
-                        'backup_count': len(backup_files),
-                        'total_size_bytes': total_size,
-                        'last_backup': status.get('last_backup'),
-                        'next_scheduled': status.get('next_scheduled'),
-                        'status': status.get('status', 'active')
-                    },
-                    'quantum_protection': {
-                        'enabled': config['quantum_protected'],
-                        'algorithm': 'ChaCha20-Poly1305' if QUANTUM_AVAILABLE else 'fallback',
-                        'rosenpass_tunnel': self.rosenpass is not None
-                    }
-                })
-                
-            except Exception as e:
-                self.logger.error(f"❌ Failed to get backup status for {client_id}: {e}")
-                return jsonify({'error': str(e)}), 500
-
-        @self.app.route('/admin/clients/<client_id>/backup/trigger', methods=['POST'])
-        def trigger_client_backup(client_id):
-            """Manually trigger backup for a specific client"""
-            try:
-                if client_id not in client_backup_configs:
-                    return jsonify({'error': 'Client backup not configured'}), 404
-                
-                data = request.get_json()
-                backup_name = data.get('backup_name', f'{client_id}_manual_{int(time.time())}')
-                source_data = data.get('data', {'manual_backup': True, 'timestamp': datetime.now().isoformat()})
-                
-                # Add client identifier to backup data
-                source_data['client_id'] = client_id
-                source_data['backup_type'] = 'manual'
-                
-                # Create client-specific backup
-                backup_result = self._create_client_backup(client_id, backup_name, source_data)
-                
-                # Update client status
-                client_backup_status[client_id].update({
+            
+            self.logger.info("💾 Initialized backup service for client %s", client_id)
+            return jsonify({
+                'client_id': client_id,
+                'status': 'initialized',
+                'quantum_protected': client_config['quantum_protected'],
+                'backup_schedule': backup_schedule
+            }), 201
+            
+        except Exception as e:
+            self.logger.error("❌ Failed to initialize backup for %s: %s", client_id, e)
+            return jsonify({'error': str(e)}), 500
+    
+    def _route_get_client_backup_status(self, client_id):
+        """Get backup status for a specific client"""
+        try:
+            self._refresh_client_state()
+            if client_id not in self._client_configs:
+                return jsonify({'error': 'Client backup not configured'}), 404
+            
+            config = self._client_configs[client_id]
+            status = self._client_status[client_id]
+            
+            # Count client's backup files and their total size
+            backup_count, total_size = self._summarize_backups(self.backup_dir / client_id)
+            
+            return jsonify({
+                'client_id': client_id,
+                'backup_config': config,
+                'backup_status': {
+                    'backup_count': backup_count,
+                    'total_size_bytes': total_size,
+                    'last_backup': status.get('last_backup'),
+                    'next_scheduled': status.get('next_scheduled'),
+                    'status': status.get('status', 'active')
+                },
+                'quantum_protection': {
+                    'enabled': config['quantum_protected'],
+                    'algorithm': 'ChaCha20-Poly1305' if QUANTUM_AVAILABLE else 'fallback',
+                    'rosenpass_tunnel': self.rosenpass is not None
+                }
+            })
+            
+        except Exception as e:
+            self.logger.error("❌ Failed to get backup status for %s: %s", client_id, e)
+            return jsonify({'error': str(e)}), 500
+    
+    async def _route_trigger_client_backup(self, client_id):
+        """Manually trigger backup for a specific client"""
+        try:
+            self._refresh_client_state()
+            if client_id not in self._client_configs:
+                return jsonify({'error': 'Client backup not configured'}), 404
+            
+            data = request.get_json()
+            backup_name = data.get('backup_name', f'{client_id}_manual_{int(time.time())}')
+            source_data = data.get('data', {'manual_backup': True, 'timestamp': datetime.now().isoformat()})
+            
+            # Add client identifier to backup data
+            source_data['client_id'] = client_id
+            source_data['backup_type'] = 'manual'
+            
+            # Create client-specific backup
+            backup_result = await self._create_client_backup(client_id, backup_name, source_data)
+            
+            # Update client status
+            with self._client_state_update():
+                self._client_status.setdefault(client_id, {}).update({
                     'last_backup': backup_result['timestamp'],
-                    'backup_count': client_backup_status[client_id].get('backup_count', 0) + 1,
+                    'backup_count': self._client_status.get(client_id, {}).get('backup_count', 0) + 1,
                     'status': 'backup_complete'
                 })
-                
-                self.logger.info(f"💾 Manual backup triggered for client {client_id}")
-                return jsonify({
-                    'client_id': client_id,
-                    'backup_id': backup_result['backup_id'],
-                    'quantum_protected': backup_result['quantum_protected'],
-                    'status': 'backup_complete',
-                    'timestamp': backup_result['timestamp']
-                }), 201
-                
-            except Exception as e:
-                self.logger.error(f"❌ Failed to trigger backup for {client_id}: {e}")
-                return jsonify({'error': str(e)}), 500
-    
-    def _create_client_backup(self, client_id: str, backup_name: str, source_data: Dict) -> Dict[str, Any]:
+            
+            self.logger.info("💾 Manual backup triggered for client %s", client_id)
+            return jsonify({
+                'client_id': client_id,
+                'backup_id': backup_result['backup_id'],
+                'quantum_protected': backup_result['quantum_protected'],
+                'status': 'backup_complete',
+                'timestamp': backup_result['timestamp']
+            }), 201
+            
+        except Exception as e:
+            self.logger.error("❌ Failed to trigger backup for %s: %s", client_id, e)
+            return jsonify({'error': str(e)}), 500
+    
+    def _read_client_state(self) -> tuple:
+        """Read persisted client backup configs and status, raising if the file is unreadable"""
+        try:
+            with open(self.client_state_file, 'rb') as f:
+                mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+                state = _loads(f.read())
+        except FileNotFoundError:
+            return {}, {}
+        configs, status = state.get('configs', {}), state.get('status', {})
+        if not isinstance(configs, dict) or not isinstance(status, dict):
+            raise ValueError(f"malformed client state in {self.client_state_file}")
+        self._state_mtime_ns = mtime_ns
+        return configs, status
+    
+    def _load_client_state(self) -> tuple:
+        """Load persisted client backup configs and status"""
+        try:
+            return self._read_client_state()
+        except Exception as e:
+            # Writes re-read the file and refuse to proceed, so this never overwrites it
+            self.logger.warning("⚠️  Failed to load client backup state: %s", e)
+            return {}, {}
+    
+    def _refresh_client_state(self):
+        """Reload client state if another worker has rewritten it since we last read it"""
+        try:
+            mtime_ns = self.client_state_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime_ns != self._state_mtime_ns:
+            with self._state_lock:
+                try:
+                    self._client_configs, self._client_status = self._read_client_state()
+                except Exception as e:
+                    # Keep serving the last good state rather than an empty one
+                    self.logger.warning("⚠️  Failed to reload client backup state: %s", e)
+                    self._state_mtime_ns = mtime_ns
+    
+    @contextlib.contextmanager
+    def _client_state_update(self):
+        """Re-read, modify and atomically rewrite client state under thread and file locks"""
+        with self._state_lock, open(self._client_state_lock_file, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Start from the latest on-disk state so other workers' changes are kept;
+                # an unreadable file raises here so it is never replaced by an empty state
+                self._client_configs, self._client_status = self._read_client_state()
+                yield
+                self._flush_client_state()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    
+    def _flush_client_state(self):
+        """Atomically rewrite the persisted client backup state; caller holds the state locks"""
+        tmp = tempfile.NamedTemporaryFile(dir=self.client_state_file.parent, prefix='clients.',
+                                          suffix='.tmp', delete=False)
+        try:
+            with tmp:
+                tmp.write(_dumps({
+                    'configs': self._client_configs,
+                    'status': self._client_status
+                }))
+            os.replace(tmp.name, self.client_state_file)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+        self._state_mtime_ns = self.client_state_file.stat().st_mtime_ns
+    
+    def _ensure_client_dir(self, client_id: str) -> Path:
+        """Return the client's backup directory, creating it on first use only"""
+        client_backup_dir = self.backup_dir / client_id
+        if client_backup_dir not in self._known_dirs:
+            client_backup_dir.mkdir(exist_ok=True)
+            self._known_dirs.add(client_backup_dir)
+        return client_backup_dir
+    
+    def _scan_max_existing_id(self) -> int:
+        """Highest numeric backup ID suffix already on disk"""
+        highest = 0
+        for backup_file in self.backup_dir.rglob('*.backup'):
+            suffix = backup_file.stem.rpartition('_')[2]
+            if suffix.isdigit():
+                highest = max(highest, int(suffix))
+        return highest
+    
+    def _reserve_backup_file(self, directory: Path, prefix: str) -> tuple:
+        """Claim the next unused backup ID by exclusively creating its .backup file"""
+        while True:
+            backup_id = f"{prefix}{next(self._id_counter)}"
+            backup_file = directory / f"{backup_id}.backup"
+            try:
+                # O_EXCL keeps IDs unique across gunicorn workers sharing the directory
+                os.close(os.open(backup_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+                return backup_id, backup_file
+            except FileExistsError:
+                continue
+    
+    def _summarize_backups(self, directory: Path) -> tuple:
+        """Count .backup files and sum their sizes in a single directory pass"""
+        count = 0
+        total = 0
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.endswith('.backup'):
+                        count += 1
+                        total += entry.stat().st_size
+        except FileNotFoundError:
+            pass
+        return count, total
+    
+    def _read_metadata(self, backup_file: Path) -> tuple:
+        """Read metadata from a backup file header, returns (metadata, payload_offset)"""
+        with open(backup_file, 'rb') as f:
+            header = f.read(_BACKUP_HEADER.size)
+            if len(header) == _BACKUP_HEADER.size:
+                magic, meta_len = _BACKUP_HEADER.unpack(header)
+                if magic == _BACKUP_MAGIC:
+                    return _loads(f.read(meta_len)), _BACKUP_HEADER.size + meta_len
+        
+        # Backups written before framing keep metadata in a .meta sidecar
+        return _loads(backup_file.with_suffix('.meta').read_bytes()), 0
+    
+    def _load_metadata(self, backup_file: Path, mtime_ns: int = None) -> tuple:
+        """Load backup metadata, reusing the parsed copy while the file is unchanged"""
+        if mtime_ns is None:
+            mtime_ns = backup_file.stat().st_mtime_ns
+        with self._meta_cache_lock:
+            cached = self._meta_cache.get(backup_file)
+            if cached and cached[0] == mtime_ns:
+                self._meta_cache.move_to_end(backup_file)
+                return cached[1], cached[2]
+        
+        metadata, offset = self._read_metadata(backup_file)
+        with self._meta_cache_lock:
+            self._meta_cache[backup_file] = (mtime_ns, metadata, offset)
+            self._meta_cache.move_to_end(backup_file)
+            if len(self._meta_cache) > METADATA_CACHE_SIZE:
+                self._meta_cache.popitem(last=False)
+        return metadata, offset
+    
+    def _backup_summary(self, backup_file: Path, st: os.stat_result) -> Dict[str, Any]:
+        """List entry for a backup, built from its cached metadata"""
+        metadata, _ = self._load_metadata(backup_file, st.st_mtime_ns)
+        return {
+            'backup_id': metadata['backup_id'],
+            'name': metadata['name'],
+            'created_at': metadata['created_at'],
+            'quantum_protected': metadata.get('quantum_protected', False),
+            'size_bytes': st.st_size
+        }
+    
+    async def _write_backup_file(self, backup_file: Path, metadata: Dict[str, Any], data_json: bytes) -> bool:
+        """Encrypt serialized backup data and write header, metadata and ciphertext in one file"""
+        if ZSTD_AVAILABLE:
+            # Level 1 runs near memory bandwidth and shrinks JSON several-fold before encryption
+            with _borrow_zstd(_zstd_compressors, lambda: zstd.ZstdCompressor(level=1)) as compressor:
+                data_json = compressor.compress(data_json)
+            metadata['compression'] = 'zstd'
+        
+        if QUANTUM_AVAILABLE and self.quantum_crypto:
+            # Encrypt with quantum crypto
+            payload = self.quantum_crypto.encrypt_data(data_json)
+            quantum_protected = True
+            metadata['encoding'] = 'quantum'
+        else:
+            # Fallback stores plaintext as-is; quantum_protected=False flags it as unencrypted
+            payload = data_json
+            quantum_protected = False
+            metadata['encoding'] = 'raw'
+        
+        metadata['quantum_protected'] = quantum_protected
+        metadata['encrypted_size'] = len(payload)
+        meta_bytes = _dumps(metadata)
+        
+        # Write to a temp file and rename so a crash never leaves a partial backup
+        tmp_file = backup_file.with_suffix('.tmp')
+        async with aiofiles.open(tmp_file, 'wb') as f:
+            await f.write(_BACKUP_HEADER.pack(_BACKUP_MAGIC, len(meta_bytes)) + meta_bytes)
+            await f.write(payload)
+        os.replace(tmp_file, backup_file)
+        return quantum_protected
+    
+    def _discard_backup_file(self, backup_file: Path):
+        """Remove a reserved backup and its temp file after a failed write"""
+        if backup_file is None:
+            return
+        for path in (backup_file, backup_file.with_suffix('.tmp')):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                self.logger.warning("⚠️  Failed to remove %s: %s", path, e)
+    
+    async def _create_client_backup(self, client_id: str, backup_name: str, source_data: Dict) -> Dict[str, Any]:
         """Create client-specific backup with quantum protection"""
-        backup_id = f"{client_id}_backup_{int(time.time())}"
         timestamp = datetime.now().isoformat()
+        backup_file = None
         
         try:
             # Ensure client backup directory exists
-            client_backup_dir = self.backup_dir / client_id
-            client_backup_dir.mkdir(exist_ok=True)
+            client_backup_dir = self._ensure_client_dir(client_id)
+            backup_id, backup_file = self._reserve_backup_file(client_backup_dir, f"{client_id}_backup_")
             
             # Serialize source data
-            data_json = json.dumps(source_data, indent=2)
+            data_json = _dumps(source_data)
+            original_size = len(data_json)
             
-            if QUANTUM_AVAILABLE and self.quantum_crypto:
-                # Encrypt with quantum crypto
-                encrypted_data = self.quantum_crypto.encrypt_data(data_json.encode())
-                quantum_protected = True
-                self.logger.info(f"✅ Quantum encryption applied to client backup {backup_id}")
-            else:
-                # Fallback encryption (basic)
-                import base64
-                encrypted_data = base64.b64encode(data_json.encode())
-                quantum_protected = False
-                self.logger.warning(f"⚠️  Fallback encryption used for client backup {backup_id}")
-            
-            # Save backup file in client directory
-            backup_file = client_backup_dir / f"{backup_id}.backup"
-            with open(backup_file, 'wb') as f:
-                f.write(encrypted_data)
-            
-            # Save metadata
             metadata = {
                 'backup_id': backup_id,
                 'client_id': client_id,
                 'name': backup_name,
                 'created_at': timestamp,
-                'quantum_protected': quantum_protected,
-                'original_size': len(data_json),
-                'encrypted_size': len(encrypted_data)
+                'original_size': original_size
             }
             
-            metadata_file = client_backup_dir / f"{backup_id}.meta"
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            # Save backup file in client directory with embedded metadata
+            quantum_protected = await self._write_backup_file(backup_file, metadata, data_json)
+            
+            if quantum_protected:
+                self.logger.info("✅ Quantum encryption applied to client backup %s", backup_id)
+            else:
+                self.logger.warning("⚠️  Fallback encryption used for client backup %s", backup_id)
             
-            self.logger.info(f"✅ Client backup created: {backup_id}")
+            self.logger.info("✅ Client backup created: %s", backup_id)
             
             return {
                 'backup_id': backup_id,
@@ -384,50 +739,38 @@ class QuantumBackupService:
             }
             
         except Exception as e:
-            self.logger.error(f"❌ Client backup creation failed: {e}")
+            self.logger.error("❌ Client backup creation failed: %s", e)
+            self._discard_backup_file(backup_file)
             raise
 
-    def _create_quantum_backup(self, backup_name: str, source_data: Dict) -> Dict[str, Any]:
+    async def _create_quantum_backup(self, backup_name: str, source_data: Dict) -> Dict[str, Any]:
         """Create backup with quantum protection"""
-        backup_id = f"backup_{int(time.time())}"
         timestamp = datetime.now().isoformat()
+        backup_file = None
         
         try:
-            # Serialize source data
-            data_json = json.dumps(source_data, indent=2)
-            
-            if QUANTUM_AVAILABLE and self.quantum_crypto:
-                # Encrypt with quantum crypto
-                encrypted_data = self.quantum_crypto.encrypt_data(data_json.encode())
-                quantum_protected = True
-                self.logger.info(f"✅ Quantum encryption applied to backup {backup_id}")
-            else:
-                # Fallback encryption (basic)
-                import base64
-                encrypted_data = base64.b64encode(data_json.encode())
-                quantum_protected = False
-                self.logger.warning(f"⚠️  Fallback encryption used for backup {backup_id}")
+            backup_id, backup_file = self._reserve_backup_file(self.backup_dir, "backup_")
             
-            # Save backup file
-            backup_file = self.backup_dir / f"{backup_id}.backup"
-            with open(backup_file, 'wb') as f:
-                f.write(encrypted_data)
+            # Serialize source data
+            data_json = _dumps(source_data)
+            original_size = len(data_json)
             
-            # Save metadata
             metadata = {
                 'backup_id': backup_id,
                 'name': backup_name,
                 'created_at': timestamp,
-                'quantum_protected': quantum_protected,
-                'original_size': len(data_json),
-                'encrypted_size': len(encrypted_data)
+                'original_size': original_size
             }
             
-            metadata_file = self.backup_dir / f"{backup_id}.meta"
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            # Save backup file with embedded metadata
+            quantum_protected = await self._write_backup_file(backup_file, metadata, data_json)
+            
+            if quantum_protected:
+                self.logger.info("✅ Quantum encryption applied to backup %s", backup_id)
+            else:
+                self.logger.warning("⚠️  Fallback encryption used for backup %s", backup_id)
             
-            self.logger.info(f"✅ Backup created: {backup_id}")
+            self.logger.info("✅ Backup created: %s", backup_id)
             
             return {
                 'backup_id': backup_id,
@@ -436,50 +779,57 @@ class QuantumBackupService:
             }
             
         except Exception as e:
-            self.logger.error(f"❌ Backup creation failed: {e}")
+            self.logger.error("❌ Backup creation failed: %s", e)
+            self._discard_backup_file(backup_file)
             raise
     
-    def _restore_quantum_backup(self, backup_id: str) -> Dict[str, Any]:
-        """Restore backup with quantum verification"""
+    async def _restore_quantum_backup(self, backup_id: str, parse: bool = True) -> Dict[str, Any]:
+        """Restore backup with quantum verification (parse=False returns the JSON bytes)"""
         try:
             backup_file = self.backup_dir / f"{backup_id}.backup"
-            metadata_file = self.backup_dir / f"{backup_id}.meta"
             
-            if not backup_file.exists() or not metadata_file.exists():
+            if not backup_file.exists():
                 raise Exception(f"Backup {backup_id} not found")
             
             # Load metadata
-            with open(metadata_file, 'r') as f:
-                metadata = json.load(f)
+            metadata, offset = self._load_metadata(backup_file)
             
-            # Load encrypted data
-            with open(backup_file, 'rb') as f:
-                encrypted_data = f.read()
+            # Load encrypted data following the metadata header
+            async with aiofiles.open(backup_file, 'rb') as f:
+                await f.seek(offset)
+                encrypted_data = await f.read()
             
             quantum_verified = False
             
             if metadata.get('quantum_protected', False) and QUANTUM_AVAILABLE and self.quantum_crypto:
                 # Decrypt with quantum crypto
                 try:
-                    decrypted_data = self.quantum_crypto.decrypt_data(encrypted_data)
-                    data_json = decrypted_data.decode()
+                    data_json = self.quantum_crypto.decrypt_data(encrypted_data)
                     quantum_verified = True
-                    self.logger.info(f"✅ Quantum decryption successful for {backup_id}")
+                    self.logger.info("✅ Quantum decryption successful for %s", backup_id)
                 except Exception as e:
-                    self.logger.error(f"❌ Quantum decryption failed: {e}")
+                    self.logger.error("❌ Quantum decryption failed: %s", e)
                     raise Exception("Quantum decryption failed - backup may be corrupted")
+            elif metadata.get('encoding') == 'raw':
+                # Fallback backups hold plaintext JSON
+                data_json = encrypted_data
+                self.logger.warning("⚠️  Unencrypted fallback backup restored for %s", backup_id)
             else:
-                # Fallback decryption
-                import base64
+                # Legacy fallback backups were base64-encoded
                 try:
-                    decrypted_data = base64.b64decode(encrypted_data)
-                    data_json = decrypted_data.decode()
-                    self.logger.warning(f"⚠️  Fallback decryption used for {backup_id}")
+                    data_json = base64.b64decode(encrypted_data)
+                    self.logger.warning("⚠️  Fallback decryption used for %s", backup_id)
                 except Exception as e:
                     raise Exception(f"Decryption failed: {e}")
             
+            if metadata.get('compression') == 'zstd':
+                if not ZSTD_AVAILABLE:
+                    raise Exception(f"Backup {backup_id} is zstd-compressed but zstandard is not installed")
+                with _borrow_zstd(_zstd_decompressors, zstd.ZstdDecompressor) as decompressor:
+                    data_json = decompressor.decompress(data_json)
+            
             # Parse restored data
-            restored_data = json.loads(data_json)
+            restored_data = _loads(data_json) if parse else data_json
             
             return {
                 'data': restored_data,
@@ -488,7 +838,7 @@ class QuantumBackupService:
             }
             
         except Exception as e:
-            self.logger.error(f"❌ Backup restore failed: {e}")
+            self.logger.error("❌ Backup restore failed: %s", e)
             raise
     
     def run(self, host='0.0.0.0', port=5000, debug=False):
@@ -496,17 +846,40 @@ class QuantumBackupService:
         try:
             # Initialize quantum protection
             if QUANTUM_AVAILABLE:
-                asyncio.run(self.initialize_quantum_protection())
+                self.initialize_quantum_protection()
             
-            self.logger.info(f"🚀 Starting Quantum Backup Service on {host}:{port}")
+            self.logger.info("🚀 Starting Quantum Backup Service on %s:%s", host, port)
             self.app.run(host=host, port=port, debug=debug)
             
         except Exception as e:
-            self.logger.error(f"❌ Failed to start backup service: {e}")
+            self.logger.error("❌ Failed to start backup service: %s", e)
             raise
 
+def create_app():
+    """Application factory for gunicorn, one service per worker"""
+    service = QuantumBackupService()
+    if QUANTUM_AVAILABLE:
+        service.initialize_quantum_protection()
+    return service.app
+
+def _exec_gunicorn(host='0.0.0.0', port=5000):
+    """Replace this process with gunicorn so concurrent backups use every core"""
+    workers = os.environ.get('GUNICORN_WORKERS') or str(os.cpu_count() or 1)
+    threads = os.environ.get('GUNICORN_THREADS', '4')
+    print(f"🚀 Starting Quantum Backup Service under gunicorn on {host}:{port}")
+    os.execvp('gunicorn', [
+        'gunicorn', '--worker-class', 'gthread',
+        '--workers', workers, '--threads', threads,
+        '--timeout', '120', '--bind', f'{host}:{port}',
+        'app:create_app()'
+    ])
+
 def main():
     """Main entry point"""
+    # Exec before building a service: each gunicorn worker builds its own in create_app()
+    if os.environ.get('FLASK_ENV') == 'production':
+        _exec_gunicorn()
+    
     service = QuantumBackupService()
     service.run()
 
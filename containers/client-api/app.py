@@ -4,24 +4,45 @@ KyberShield Client Management API
 Handles client onboarding, configuration, and service management
 """
 
-from flask import Flask, request, jsonify, g
+from flask import Flask, Response, request, jsonify, g, stream_with_context, has_request_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from functools import wraps
 import jwt
 import json
+import orjson
 import time
 import logging
 import hashlib
+import hmac
+import gzip
 import base64
 import uuid
+import secrets
 import sqlite3
+import queue
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import os
 from datetime import datetime, timedelta
+from calendar import timegm
+from collections import OrderedDict
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import bcrypt
 
+class ORJSONProvider(DefaultJSONProvider):
+    """Route jsonify and request.get_json through orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)
 
 # Configure logging
@@ -40,17 +61,154 @@ if os.environ.get('DB_CREDENTIALS'):
 
 # Configuration
 JWT_SECRET_KEY = "your-super-secure-jwt-secret-key"  # Use environment variable in production
-DATABASE_PATH = "/app/data/clients.sqlite"
+# Point at a tmpfs or gp3-backed mount via DATABASE_PATH; the defaults size the
+# page cache and mmap window to hold the whole clients DB in memory
+DATABASE_PATH = os.environ.get('DATABASE_PATH', "/app/data/clients.sqlite")
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', str(1 << 30)))
+SQLITE_CACHE_KIB = int(os.environ.get('SQLITE_CACHE_KIB', '131072'))
+SCHEMA_VERSION = 1
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '8'))
+# Seconds to wait for a free pooled connection before failing the request
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '5'))
+# Only passwords pay bcrypt; dev/test builds drop to the minimum cost so fixtures stay fast
+KYBERSHIELD_ENV = os.environ.get('KYBERSHIELD_ENV', 'production')
+BCRYPT_COST = int(os.environ.get('BCRYPT_COST', '4' if KYBERSHIELD_ENV in ('dev', 'test') else '12'))
+
+# bcrypt releases the GIL; cap concurrent hashes at core count so logins
+# don't oversubscribe the CPU while other request threads keep serving
+_bcrypt_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='bcrypt')
+
+# Keep-alive session and worker pool for fanning out to the other KyberShield services
+# (connect, read) - a dead peer fails on connect long before a slow one times out
+SERVICE_REQUEST_TIMEOUT = (2, 5)
+http_session = requests.Session()
+http_session.mount('http://', HTTPAdapter(pool_connections=32, pool_maxsize=32))
+http_session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32))
+_service_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='service-probe')
+SERVICE_ENDPOINT_TEMPLATES = {
+    'firewall': "http://kyber-shield-firewall-staging:3000/admin/clients/{cid}/firewall/status",
+    'database': "http://kyber-shield-database-staging:5000/admin/clients/{cid}",
+    'vpn': "http://kyber-shield-rosenpass-staging:8080/admin/clients/{cid}/vpn/status",
+    'backup': "http://kyber-shield-backup-staging:8000/admin/clients/{cid}/backup/status",
+    'monitoring': "http://kyber-shield-monitoring-staging:8888/admin/clients/{cid}/monitoring/status"
+}
+
+# Applied once to every pooled connection
+SQLITE_PRAGMAS = (
+    'page_size=4096',  # only takes effect before the file's first write
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+    'temp_store=MEMORY',
+    f'mmap_size={SQLITE_MMAP_SIZE}',
+    f'cache_size=-{SQLITE_CACHE_KIB}',
+)
+
+# SQL statements, reused verbatim so each pooled connection's statement cache hits
+SQL_INSERT_CLIENT = '''
+    INSERT INTO clients (id, email, company_name, password_hash, api_key, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+SQL_SELECT_CLIENT_BY_EMAIL = 'SELECT id, email, company_name, plan, password_hash FROM clients WHERE email = ?'
+SQL_SELECT_CLIENT_BY_APIKEY = 'SELECT id, api_key FROM clients WHERE api_key = ?'
+SQL_UPDATE_LAST_LOGIN = 'UPDATE clients SET last_login = ? WHERE id = ?'
+SQL_INSERT_FW_RULE = '''
+    INSERT INTO firewall_configs 
+    (id, client_id, rule_name, rule_type, source_ip, destination_port, action, priority, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+SQL_INSERT_DB_CFG = '''
+    INSERT INTO database_configs
+    (id, client_id, db_name, db_host, db_port, protection_level, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+SQL_SELECT_FW_BY_CLIENT = 'SELECT * FROM firewall_configs WHERE client_id = ? AND enabled = 1'
+SQL_SELECT_DB_BY_CLIENT = 'SELECT * FROM database_configs WHERE client_id = ?'
+SQL_COUNT_CLIENTS = 'SELECT COUNT(*) FROM clients'
+SQL_COUNT_TOTALS = "SELECT COUNT(*), COALESCE(SUM(status = 'active'), 0) FROM clients"
+SQL_LIST_CLIENTS = '''
+    SELECT id, company_name, email, plan, created_at, status, last_login
+    FROM clients
+    ORDER BY created_at DESC
+'''
+
+def _b64url_encode(data):
+    """Unpadded base64url, as used by JWT"""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+def _b64url_decode(data):
+    """Decode unpadded base64url"""
+    return base64.urlsafe_b64decode(data + b'=' * (-len(data) % 4))
+
+# HS256 tokens always carry the same header, and the keyed HMAC state can be
+# copied per token instead of re-deriving the inner/outer pads every call
+_JWT_HEADER_B64 = _b64url_encode(b'{"alg":"HS256","typ":"JWT"}')
+_JWT_HMAC = hmac.new(JWT_SECRET_KEY.encode('utf-8'), digestmod=hashlib.sha256)
+
+def _jwt_signature(signing_input):
+    """HMAC-SHA256 of a JWT signing input"""
+    mac = _JWT_HMAC.copy()
+    mac.update(signing_input)
+    return mac.digest()
+
+def encode_token(payload):
+    """Issue an HS256 JWT for the given claims"""
+    claims = dict(payload)
+    if isinstance(claims.get('exp'), datetime):
+        claims['exp'] = timegm(claims['exp'].utctimetuple())
+    
+    signing_input = _JWT_HEADER_B64 + b'.' + _b64url_encode(orjson.dumps(claims))
+    return (signing_input + b'.' + _b64url_encode(_jwt_signature(signing_input))).decode('ascii')
+
+def decode_token(token):
+    """Verify an HS256 JWT and return its claims, raising PyJWT's exception types"""
+    try:
+        header_b64, payload_b64, signature_b64 = token.encode('utf-8').split(b'.')
+        if header_b64 != _JWT_HEADER_B64 and orjson.loads(_b64url_decode(header_b64)).get('alg') != 'HS256':
+            raise jwt.InvalidAlgorithmError('The specified alg value is not allowed')
+        signature = _b64url_decode(signature_b64)
+    except jwt.InvalidTokenError:
+        raise
+    except Exception as e:
+        raise jwt.DecodeError(f'Invalid token: {e}')
+    
+    if not hmac.compare_digest(signature, _jwt_signature(header_b64 + b'.' + payload_b64)):
+        raise jwt.InvalidSignatureError('Signature verification failed')
+    
+    try:
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except Exception as e:
+        raise jwt.DecodeError(f'Invalid payload: {e}')
+    if not isinstance(payload, dict):
+        raise jwt.DecodeError('Invalid payload')
+    
+    exp = payload.get('exp')
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise jwt.DecodeError('Expiration Time claim (exp) must be an integer')
+        if exp <= time.time():
+            raise jwt.ExpiredSignatureError('Signature has expired')
+    return payload
+
+def now_iso():
+    """ISO timestamp shared by every insert/response within the current request"""
+    if has_request_context():
+        return g.now_iso
+    return datetime.utcnow().isoformat()
 
 class ClientManager:
     def __init__(self):
         """Initialize client management system"""
+        # Long-lived connections keep the page and statement caches warm
+        self._pool = queue.Queue(maxsize=DB_POOL_SIZE)
+        for _ in range(DB_POOL_SIZE):
+            self._pool.put(self._open_connection())
+        
         self.init_database()
         logger.info("🎯 KyberShield Client Manager initialized")
     
     def init_database(self):
         """Initialize client database schema"""
-        with self.get_db_connection() as conn:
+        with self.transaction() as conn:
             # Client accounts table
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS clients (
@@ -111,30 +269,77 @@ class ClientManager:
                     FOREIGN KEY (client_id) REFERENCES clients (id)
                 )
             ''')
+            
+            # Per-client lookups used by /api/v1/status (email and api_key are indexed via UNIQUE)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_fw_client ON firewall_configs (client_id, enabled)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_db_client ON database_configs (client_id)')
+            
+            # BEGIN IMMEDIATE means only the first worker to start sees the old version
+            migrated = conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION
+            if migrated:
+                conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        
+        if migrated:
+            # Rewrite the file contiguously once after a schema change
+            with self.get_db_connection() as conn:
+                conn.execute('VACUUM')
         
         logger.info("✅ Client database initialized")
     
+    def _open_connection(self):
+        """Open a pooled database connection with statement caching and tuned PRAGMAs"""
+        conn = sqlite3.connect(
+            DATABASE_PATH,
+            check_same_thread=False,
+            cached_statements=256,
+            isolation_level=None
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(f'PRAGMA {pragma}')
+        return conn
+    
     @contextmanager
     def get_db_connection(self):
-        """Get database connection with proper cleanup"""
-        conn = sqlite3.connect(DATABASE_PATH)
-        conn.row_factory = sqlite3.Row
+        """Borrow a database connection from the pool"""
+        try:
+            conn = self._pool.get(timeout=DB_POOL_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError("Database connection pool exhausted") from None
         try:
             yield conn
         finally:
-            conn.close()
+            # Never hand the next borrower a half-finished transaction
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+    
+    @contextmanager
+    def transaction(self):
+        """Borrow a pooled connection and run the block as one write transaction"""
+        with self.get_db_connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
     
     def generate_api_key(self):
         """Generate secure API key for client"""
-        return f"ks_{uuid.uuid4().hex[:16]}_{hashlib.sha256(str(time.time()).encode()).hexdigest()[:16]}"
+        return f"ks_{secrets.token_urlsafe(24)}"
     
     def hash_password(self, password):
         """Hash password using bcrypt"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        salt = bcrypt.gensalt(rounds=BCRYPT_COST)
+        return _bcrypt_executor.submit(bcrypt.hashpw, password.encode('utf-8'), salt).result().decode('utf-8')
     
     def verify_password(self, password, password_hash):
         """Verify password against hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        return _bcrypt_executor.submit(
+            bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8')
+        ).result()
     
     def create_client(self, email, company_name, password):
         """Create new client account"""
@@ -143,12 +348,10 @@ class ClientManager:
             api_key = self.generate_api_key()
             password_hash = self.hash_password(password)
             
-            with self.get_db_connection() as conn:
-                conn.execute('''
-                    INSERT INTO clients (id, email, company_name, password_hash, api_key, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (client_id, email, company_name, password_hash, api_key, datetime.utcnow().isoformat()))
-                conn.commit()
+            with self.transaction() as conn:
+                conn.execute(SQL_INSERT_CLIENT, (
+                    client_id, email, company_name, password_hash, api_key, now_iso()
+                ))
             
             logger.info(f"✅ Created new client: {company_name} ({email})")
             return {
@@ -167,41 +370,153 @@ class ClientManager:
     def authenticate_client(self, email, password):
         """Authenticate client login"""
         with self.get_db_connection() as conn:
-            cursor = conn.execute('SELECT * FROM clients WHERE email = ?', (email,))
-            client = cursor.fetchone()
-            
-            if client and self.verify_password(password, client['password_hash']):
-                # Update last login
-                conn.execute(
-                    'UPDATE clients SET last_login = ? WHERE id = ?',
-                    (datetime.utcnow().isoformat(), client['id'])
-                )
-                conn.commit()
-                
-                return dict(client)
+            client = conn.execute(SQL_SELECT_CLIENT_BY_EMAIL, (email,)).fetchone()
         
-        return None
+        # bcrypt runs with no pooled connection held so logins can't starve other requests
+        if not client or not self.verify_password(password, client['password_hash']):
+            return None
+        
+        # Update last login
+        with self.get_db_connection() as conn:
+            conn.execute(SQL_UPDATE_LAST_LOGIN, (now_iso(), client['id']))
+        
+        return client
     
     def get_client_by_api_key(self, api_key):
-        """Get client by API key"""
+        """Get client id row by API key (keys are random tokens, looked up as-is - never bcrypt them)"""
         with self.get_db_connection() as conn:
-            cursor = conn.execute('SELECT * FROM clients WHERE api_key = ?', (api_key,))
+            cursor = conn.execute(SQL_SELECT_CLIENT_BY_APIKEY, (api_key,))
             client = cursor.fetchone()
-            return dict(client) if client else None
+        
+        # Constant-time confirm so a future hashed/prefix lookup can't leak timing
+        if client and hmac.compare_digest(client['api_key'].encode('utf-8'), api_key.encode('utf-8')):
+            return client
+        return None
     
     def get_client_count(self):
         """Get total number of registered clients"""
         try:
             with self.get_db_connection() as conn:
-                cursor = conn.execute('SELECT COUNT(*) as count FROM clients')
+                cursor = conn.execute(SQL_COUNT_CLIENTS)
                 result = cursor.fetchone()
-                return result['count'] if result else 0
+                return result[0] if result else 0
         except Exception:
             return 0
 
 # Initialize client manager
 client_manager = ClientManager()
 
+@app.before_request
+def stash_request_time():
+    """Format the request timestamp once instead of per insert"""
+    g.now_iso = datetime.utcnow().isoformat()
+
+GZIP_MIN_SIZE = 1024
+
+def _accepts_gzip():
+    return 'gzip' in request.headers.get('Accept-Encoding', '')
+
+@app.after_request
+def compress_response(response):
+    """Gzip JSON bodies over GZIP_MIN_SIZE when the client accepts it"""
+    if (response.direct_passthrough or response.is_streamed
+            or not 200 <= response.status_code < 300
+            or 'Content-Encoding' in response.headers
+            or not _accepts_gzip()):
+        return response
+    
+    data = response.get_data()
+    if len(data) < GZIP_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(data, compresslevel=5))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    # The gzip body differs from the identity one, so it must not share a strong ETag
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-gz', weak)
+    return response
+
+# Polled endpoints rebuild their JSON at most once per SNAPSHOT_TTL seconds
+SNAPSHOT_TTL = 1
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+def snapshot_response(key, build):
+    """Serve a briefly cached JSON snapshot with an ETag, answering 304 when unchanged"""
+    window = int(time.time()) // SNAPSHOT_TTL
+    with _snapshots_lock:
+        snapshot = _snapshots.get(key)
+    if snapshot is None or snapshot[0] != window:
+        # Build outside the lock so a slow snapshot doesn't stall the others
+        body = app.json.dumps(build()).encode('utf-8')
+        # [window, body, etag, gzip body built on first gzip request]
+        snapshot = [window, body, hashlib.blake2b(body, digest_size=8).hexdigest(), None]
+        with _snapshots_lock:
+            current = _snapshots.get(key)
+            if current is not None and current[0] == window:
+                # Another thread built this window first; serve its copy
+                snapshot = current
+            else:
+                _snapshots[key] = snapshot
+    
+    body, etag = snapshot[1], snapshot[2]
+    compress = len(body) >= GZIP_MIN_SIZE
+    if compress and _accepts_gzip():
+        gz_body = snapshot[3]
+        if gz_body is None:
+            gz_body = gzip.compress(body, compresslevel=5)
+            with _snapshots_lock:
+                if snapshot[3] is None:
+                    snapshot[3] = gz_body
+                gz_body = snapshot[3]
+        body, etag = gz_body, f'{etag}-gz'
+    
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    if compress:
+        response.vary.add('Accept-Encoding')
+        if etag.endswith('-gz'):
+            response.headers['Content-Encoding'] = 'gzip'
+    return response.make_conditional(request)
+
+# Resolved Authorization headers: header -> (client_id or None, expires_at)
+AUTH_CACHE_SIZE = 4096
+API_KEY_CACHE_TTL = 60
+API_KEY_NEGATIVE_TTL = 5
+_auth_cache = OrderedDict()
+_auth_cache_lock = threading.Lock()
+
+def _resolve_auth(auth_header):
+    """Resolve a Bearer/ApiKey header to a client_id (None for an unknown API key)"""
+    now = time.time()
+    with _auth_cache_lock:
+        cached = _auth_cache.get(auth_header)
+        if cached and cached[1] > now:
+            _auth_cache.move_to_end(auth_header)
+            return cached[0]
+    
+    if auth_header.startswith('Bearer '):
+        token = auth_header.split(' ')[1]
+        payload = decode_token(token)
+        client_id = payload['client_id']
+        # Valid until the token itself expires
+        expires_at = payload.get('exp', now + API_KEY_CACHE_TTL)
+    else:
+        api_key = auth_header.split(' ')[1]
+        client = client_manager.get_client_by_api_key(api_key)
+        client_id = client['id'] if client else None
+        # Unknown keys are remembered briefly so guessing can't hammer the database
+        expires_at = now + (API_KEY_CACHE_TTL if client else API_KEY_NEGATIVE_TTL)
+    
+    with _auth_cache_lock:
+        _auth_cache[auth_header] = (client_id, expires_at)
+        _auth_cache.move_to_end(auth_header)
+        if len(_auth_cache) > AUTH_CACHE_SIZE:
+            _auth_cache.popitem(last=False)
+    return client_id
+
 def require_auth(f):
     """Decorator for API authentication"""
     @wraps(f)
@@ -211,46 +526,44 @@ def require_auth(f):
         if not auth_header:
             return jsonify({'error': 'Authorization header required'}), 401
         
+        # Support both JWT and API Key authentication
+        if not auth_header.startswith(('Bearer ', 'ApiKey ')):
+            return jsonify({'error': 'Invalid authorization format'}), 401
+        
         try:
-            # Support both JWT and API Key authentication
-            if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
-                payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=['HS256'])
-                g.client_id = payload['client_id']
-                
-            elif auth_header.startswith('ApiKey '):
-                api_key = auth_header.split(' ')[1]
-                client = client_manager.get_client_by_api_key(api_key)
-                if not client:
-                    return jsonify({'error': 'Invalid API key'}), 401
-                g.client_id = client['id']
-                
-            else:
-                return jsonify({'error': 'Invalid authorization format'}), 401
-                
+            client_id = _resolve_auth(auth_header)
         except jwt.ExpiredSignatureError:
             return jsonify({'error': 'Token expired'}), 401
         except jwt.InvalidTokenError:
             return jsonify({'error': 'Invalid token'}), 401
         
+        if client_id is None:
+            return jsonify({'error': 'Invalid API key'}), 401
+        g.client_id = client_id
+        
         return f(*args, **kwargs)
     
     return decorated_function
 
+# Static part of the /health body; only the count and timestamp change per call
+HEALTH_BASE = {
+    'status': 'healthy',
+    'service': 'kyber-shield-client-api',
+    'quantum_services': {
+        'firewall': 'ML-DSA-87 (NIST Level 5)',
+        'database': 'ML-DSA-87 (NIST Level 5)', 
+        'rosenpass_vpn': 'ML-KEM-768 (NIST Level 3)',
+        'backup': 'ChaCha20-Poly1305'
+    }
+}
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint with quantum services status"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'kyber-shield-client-api',
-        'quantum_services': {
-            'firewall': 'ML-DSA-87 (NIST Level 5)',
-            'database': 'ML-DSA-87 (NIST Level 5)', 
-            'rosenpass_vpn': 'ML-KEM-768 (NIST Level 3)',
-            'backup': 'ChaCha20-Poly1305'
-        },
+    return snapshot_response('health', lambda: {
+        **HEALTH_BASE,
         'clients_registered': client_manager.get_client_count(),
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': now_iso()
     })
 
 @app.route('/api/v1/clients/register', methods=['POST'])
@@ -268,11 +581,11 @@ def register_client():
         client = client_manager.create_client(email, company_name, password)
         
         # Generate JWT token
-        token = jwt.encode({
+        token = encode_token({
             'client_id': client['client_id'],
             'email': email,
             'exp': datetime.utcnow() + timedelta(hours=24)
-        }, JWT_SECRET_KEY, algorithm='HS256')
+        })
         
         logger.info(f"🎉 New client registered: {company_name}")
         return jsonify({
@@ -304,11 +617,11 @@ def login_client():
             return jsonify({'error': 'Invalid credentials'}), 401
         
         # Generate JWT token
-        token = jwt.encode({
+        token = encode_token({
             'client_id': client['id'],
             'email': email,
             'exp': datetime.utcnow() + timedelta(hours=24)
-        }, JWT_SECRET_KEY, algorithm='HS256')
+        })
         
         return jsonify({
             'status': 'authenticated',
@@ -342,16 +655,11 @@ def configure_firewall():
         
         rule_id = str(uuid.uuid4())
         
-        with client_manager.get_db_connection() as conn:
-            conn.execute('''
-                INSERT INTO firewall_configs 
-                (id, client_id, rule_name, rule_type, source_ip, destination_port, action, priority, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        with client_manager.transaction() as conn:
+            conn.execute(SQL_INSERT_FW_RULE, (
                 rule_id, g.client_id, rule_name, rule_type, source_ip, 
-                destination_port, rule_type, priority, datetime.utcnow().isoformat()
+                destination_port, rule_type, priority, now_iso()
             ))
-            conn.commit()
         
         # Call quantum firewall service to apply rule
         firewall_response = apply_firewall_rule(g.client_id, {
@@ -390,16 +698,11 @@ def protect_database():
         
         config_id = str(uuid.uuid4())
         
-        with client_manager.get_db_connection() as conn:
-            conn.execute('''
-                INSERT INTO database_configs
-                (id, client_id, db_name, db_host, db_port, protection_level, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        with client_manager.transaction() as conn:
+            conn.execute(SQL_INSERT_DB_CFG, (
                 config_id, g.client_id, db_name, db_host, db_port, 
-                protection_level, datetime.utcnow().isoformat()
+                protection_level, now_iso()
             ))
-            conn.commit()
         
         # Setup quantum database protection
         database_response = setup_database_protection(g.client_id, {
@@ -428,16 +731,10 @@ def get_client_status():
     try:
         # Get firewall rules
         with client_manager.get_db_connection() as conn:
-            firewall_cursor = conn.execute(
-                'SELECT * FROM firewall_configs WHERE client_id = ? AND enabled = 1',
-                (g.client_id,)
-            )
+            firewall_cursor = conn.execute(SQL_SELECT_FW_BY_CLIENT, (g.client_id,))
             firewall_rules = [dict(row) for row in firewall_cursor.fetchall()]
             
-            database_cursor = conn.execute(
-                'SELECT * FROM database_configs WHERE client_id = ?',
-                (g.client_id,)
-            )
+            database_cursor = conn.execute(SQL_SELECT_DB_BY_CLIENT, (g.client_id,))
             database_configs = [dict(row) for row in database_cursor.fetchall()]
         
         # Get real-time service status
@@ -477,7 +774,7 @@ def apply_firewall_rule(client_id, rule_config):
             'status': 'applied',
             'rule_id': rule_config['rule_id'],
             'quantum_signature': 'ML-DSA-87',
-            'applied_at': datetime.utcnow().isoformat()
+            'applied_at': now_iso()
         }
     except Exception as e:
         logger.error(f"Firewall rule application failed: {e}")
@@ -493,7 +790,7 @@ def setup_database_protection(client_id, db_config):
             'config_id': db_config['config_id'],
             'encryption': 'ML-DSA-87',
             'backup_enabled': True,
-            'protected_at': datetime.utcnow().isoformat()
+            'protected_at': now_iso()
         }
     except Exception as e:
         logger.error(f"Database protection setup failed: {e}")
@@ -517,32 +814,36 @@ def get_service_health_status():
 def admin_list_clients():
     """Admin endpoint to list all clients with their status"""
     try:
-        with client_manager.get_db_connection() as conn:
-            cursor = conn.execute('''
-                SELECT client_id, company_name, contact_email, plan_type, 
-                       created_at, status, last_login 
-                FROM clients 
-                ORDER BY created_at DESC
-            ''')
-            clients = []
-            
-            for row in cursor.fetchall():
-                clients.append({
-                    'client_id': row[0],
-                    'company_name': row[1],
-                    'contact_email': row[2],
-                    'plan_type': row[3],
-                    'created_at': row[4],
-                    'status': row[5],
-                    'last_login': row[6]
-                })
+        def generate():
+            # Rows are encoded as they are read so the full table is never held in memory
+            with client_manager.get_db_connection() as conn:
+                cursor = conn.execute(SQL_LIST_CLIENTS)
+                cursor.arraysize = 1000
+                
+                yield b'{"clients":['
+                total_clients = 0
+                active_clients = 0
+                for row in cursor:
+                    yield (b',' if total_clients else b'') + orjson.dumps({
+                        'client_id': row[0],
+                        'company_name': row[1],
+                        'contact_email': row[2],
+                        'plan_type': row[3],
+                        'created_at': row[4],
+                        'status': row[5],
+                        'last_login': row[6]
+                    })
+                    total_clients += 1
+                    if row[5] == 'active':
+                        active_clients += 1
+                
+                yield b'],' + orjson.dumps({
+                    'total_clients': total_clients,
+                    'active_clients': active_clients,
+                    'timestamp': now_iso()
+                })[1:]
         
-        return jsonify({
-            'clients': clients,
-            'total_clients': len(clients),
-            'active_clients': len([c for c in clients if c['status'] == 'active']),
-            'timestamp': datetime.utcnow().isoformat()
-        })
+        return Response(stream_with_context(generate()), mimetype='application/json')
         
     except Exception as e:
         logger.error(f"❌ Admin list clients failed: {e}")
@@ -554,7 +855,7 @@ def admin_get_client_services(client_id):
     try:
         # Get client information
         with client_manager.get_db_connection() as conn:
-            cursor = conn.execute('SELECT * FROM clients WHERE client_id = ?', (client_id,))
+            cursor = conn.execute('SELECT company_name, email, plan, status FROM clients WHERE id = ?', (client_id,))
             client = cursor.fetchone()
             
             if not client:
@@ -562,17 +863,15 @@ def admin_get_client_services(client_id):
         
         # Get service status from other containers
         services_status = {}
-        service_endpoints = {
-            'firewall': f"http://kyber-shield-firewall-staging:3000/admin/clients/{client_id}/firewall/status",
-            'database': f"http://kyber-shield-database-staging:5000/admin/clients/{client_id}",
-            'vpn': f"http://kyber-shield-rosenpass-staging:8080/admin/clients/{client_id}/vpn/status",
-            'backup': f"http://kyber-shield-backup-staging:8000/admin/clients/{client_id}/backup/status",
-            'monitoring': f"http://kyber-shield-monitoring-staging:8888/admin/clients/{client_id}/monitoring/status"
-        }
         
-        for service, endpoint in service_endpoints.items():
+        # Query all services concurrently over pooled connections
+        futures = {
+            service: _service_executor.submit(http_session.get, template.format(cid=client_id), timeout=SERVICE_REQUEST_TIMEOUT)
+            for service, template in SERVICE_ENDPOINT_TEMPLATES.items()
+        }
+        for service, future in futures.items():
             try:
-                response = requests.get(endpoint, timeout=5)
+                response = future.result()
                 if response.status_code == 200:
                     services_status[service] = response.json()
                 else:
@@ -583,13 +882,13 @@ def admin_get_client_services(client_id):
         return jsonify({
             'client_id': client_id,
             'client_info': {
-                'company_name': client[2],
-                'contact_email': client[3],
-                'plan_type': client[4],
-                'status': client[6]
+                'company_name': client['company_name'],
+                'contact_email': client['email'],
+                'plan_type': client['plan'],
+                'status': client['status']
             },
             'services': services_status,
-            'last_updated': datetime.utcnow().isoformat()
+            'last_updated': now_iso()
         })
         
     except Exception as e:
@@ -602,22 +901,22 @@ def admin_generate_portal_credentials(client_id):
     try:
         # Get client information
         with client_manager.get_db_connection() as conn:
-            cursor = conn.execute('SELECT company_name, contact_email FROM clients WHERE client_id = ?', (client_id,))
+            cursor = conn.execute('SELECT company_name, email FROM clients WHERE id = ?', (client_id,))
             client = cursor.fetchone()
             
             if not client:
                 return jsonify({'error': 'Client not found'}), 404
         
         # Generate new portal credentials
-        temp_password = base64.b64encode(uuid.uuid4().bytes).decode('utf-8')[:12]
+        temp_password = secrets.token_urlsafe(9)
         
         portal_credentials = {
             'client_id': client_id,
             'portal_url': f"https://portal.kybershield.ai/{client_id}",
-            'username': client[1],  # contact_email
+            'username': client[1],  # email
             'temporary_password': temp_password,
             'force_password_change': True,
-            'generated_at': datetime.utcnow().isoformat(),
+            'generated_at': now_iso(),
             'expires_at': (datetime.utcnow() + timedelta(hours=24)).isoformat()
         }
         
@@ -639,47 +938,46 @@ def admin_generate_portal_credentials(client_id):
 def admin_platform_overview():
     """Admin endpoint for complete platform overview"""
     try:
-        # Get client statistics
-        with client_manager.get_db_connection() as conn:
-            cursor = conn.execute('SELECT COUNT(*) FROM clients')
-            total_clients = cursor.fetchone()[0]
-            
-            cursor = conn.execute("SELECT COUNT(*) FROM clients WHERE status = 'active'")
-            active_clients = cursor.fetchone()[0]
-        
-        # Get platform metrics (would be real data in production)
-        platform_metrics = {
-            'clients': {
-                'total': total_clients,
-                'active': active_clients,
-                'inactive': total_clients - active_clients
-            },
-            'security': {
-                'threats_blocked_today': 1247,
-                'total_traffic_encrypted': '127.3 GB',
-                'quantum_signatures_verified': 8934,
-                'active_vpn_connections': 34
-            },
-            'services': {
-                'firewall': 'healthy',
-                'database': 'healthy',
-                'backup': 'healthy',
-                'vpn': 'healthy',
-                'monitoring': 'healthy',
-                'client_api': 'healthy'
-            },
-            'revenue': {
-                'monthly_recurring': 23500,
-                'new_trials_this_week': 12,
-                'conversion_rate': 0.68
+        def build():
+            # Get client statistics
+            with client_manager.get_db_connection() as conn:
+                total_clients, active_clients = conn.execute(SQL_COUNT_TOTALS).fetchone()
+        
+            # Get platform metrics (would be real data in production)
+            platform_metrics = {
+                'clients': {
+                    'total': total_clients,
+                    'active': active_clients,
+                    'inactive': total_clients - active_clients
+                },
+                'security': {
+                    'threats_blocked_today': 1247,
+                    'total_traffic_encrypted': '127.3 GB',
+                    'quantum_signatures_verified': 8934,
+                    'active_vpn_connections': 34
+                },
+                'services': {
+                    'firewall': 'healthy',
+                    'database': 'healthy',
+                    'backup': 'healthy',
+                    'vpn': 'healthy',
+                    'monitoring': 'healthy',
+                    'client_api': 'healthy'
+                },
+                'revenue': {
+                    'monthly_recurring': 23500,
+                    'new_trials_this_week': 12,
+                    'conversion_rate': 0.68
+                }
             }
-        }
         
-        return jsonify({
-            'platform_overview': platform_metrics,
-            'timestamp': datetime.utcnow().isoformat(),
-            'quantum_protection_active': True
-        })
+            return {
+                'platform_overview': platform_metrics,
+                'timestamp': now_iso(),
+                'quantum_protection_active': True
+            }
+        
+        return snapshot_response('platform_overview', build)
         
     except Exception as e:
         logger.error(f"❌ Admin platform overview failed: {e}")
@@ -4,16 +4,22 @@ KyberShield Database Security - ML-DSA-87 Record Signing
 Handles database operations with post-quantum digital signatures
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, stream_with_context
 import json
+import orjson
 import time
 import logging
 import hashlib
-import base64
+import binascii
 import sqlite3
+import threading
+import itertools
 import os
-from datetime import datetime
+import fcntl
+import atexit
+from collections import OrderedDict, deque
 from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 
 app = Flask(__name__)
 
@@ -30,6 +36,14 @@ except ImportError as e:
     QUANTUM_AVAILABLE = False
     logger.warning(f"⚠️ liboqs not available, using fallback: {e}")
 
+# BLAKE3 hashes records and keys the fallback MAC in a single SIMD pass
+try:
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+    logger.warning("⚠️ blake3 not available, hashing records with SHA3-256")
+
 # Handle ECS DB_CREDENTIALS environment variable
 db_creds = None
 if os.environ.get('DB_CREDENTIALS'):
@@ -40,18 +54,190 @@ if os.environ.get('DB_CREDENTIALS'):
         logger.warning(f"⚠️ Could not parse DB_CREDENTIALS: {e}")
         db_creds = None
 
+# Applied to every connection; WAL lets readers proceed while a write commits
+SQLITE_PRAGMAS = (
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+    'busy_timeout=5000',
+    'cache_size=-65536',
+    'temp_store=MEMORY',
+)
+
+# BLAKE3 keyed mode takes exactly 32 bytes of key
+FALLBACK_MAC_KEY = hashlib.sha256(b"fallback_key").digest()
+
+def record_digest(record_bytes):
+    """32-byte digest of a serialized record"""
+    if BLAKE3_AVAILABLE:
+        return blake3(record_bytes).digest()
+    return hashlib.sha3_256(record_bytes).digest()
+
+# utcnow().isoformat() equivalent that formats the date/time part once per second
+_ts_cache = (0, '')
+
+def fast_iso_utc():
+    """Current UTC time as an ISO-8601 string with microseconds"""
+    global _ts_cache
+    ns = time.time_ns()
+    sec = ns // 1_000_000_000
+    if sec != _ts_cache[0]:
+        _ts_cache = (sec, time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec)))
+    return f"{_ts_cache[1]}.{ns % 1_000_000_000 // 1000:06d}"
+
+# Serialized GET bodies keyed by (endpoint, client_id). Writes through this
+# process invalidate their keys; the TTL bounds staleness across workers.
+RESPONSE_CACHE_SIZE = 4096
+RESPONSE_CACHE_TTL = 5
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+def cached_json_response(key, build):
+    """Serve key's cached JSON body, or build it (a dict, encoded bytes, or a Response that bypasses the cache)"""
+    now = time.monotonic()
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached and cached[1] > now:
+            _response_cache.move_to_end(key)
+            return app.response_class(cached[0], mimetype='application/json')
+    
+    result = build()
+    if isinstance(result, app.response_class):
+        return result
+    
+    body = result if isinstance(result, bytes) else orjson.dumps(result)
+    with _response_cache_lock:
+        _response_cache[key] = (body, now + RESPONSE_CACHE_TTL)
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    return app.response_class(body, mimetype='application/json')
+
+def invalidate_responses(*keys):
+    """Drop cached GET bodies after a write"""
+    with _response_cache_lock:
+        for key in keys:
+            _response_cache.pop(key, None)
+
+# One keypair per container, shared by every gunicorn worker via tmpfs so any
+# worker can verify what another signed
+KEYPAIR_PATH = os.environ.get('KEYPAIR_PATH', '/dev/shm/kybershield.keys')
+
+# Opt-in write-behind: with ASYNC_WRITE_INTERVAL > 0, single /store writes are
+# acknowledged once signed and committed by a background flusher every interval.
+# The default (0) commits before acknowledging. Queued rows that still fail to
+# insert are appended to DEAD_LETTER_PATH instead of being dropped.
+ASYNC_WRITE_INTERVAL = float(os.environ.get('ASYNC_WRITE_INTERVAL', '0'))
+ASYNC_WRITE_BATCH = 256
+DEAD_LETTER_PATH = os.environ.get('DEAD_LETTER_PATH', '/app/data/dead_letter.jsonl')
+
+# Optional process pool for ML-DSA-87 signing. liboqs-python calls into C via
+# ctypes, which already drops the GIL, so request threads sign in parallel
+# without it; the pool helps when signing competes with heavy Python glue.
+SIGNING_WORKERS = int(os.environ.get('SIGNING_WORKERS', '0'))
+
+def make_detached_signer(signer):
+    """Return a sign(message) that calls OQS_SIG_sign into a reused per-thread buffer
+    
+    Signature.sign allocates and copies a fresh signature-sized buffer on every
+    call; falls back to it if this liboqs-python's internals differ.
+    """
+    try:
+        import ctypes
+        from oqs.oqs import native
+        oqs_sign = native().OQS_SIG_sign
+        sig = signer._sig
+        secret_key = signer.secret_key
+        signature_length = sig.contents.length_signature
+    except (ImportError, AttributeError):
+        return signer.sign
+    
+    buffers = threading.local()
+    
+    def sign(message):
+        buffer = getattr(buffers, 'buffer', None)
+        if buffer is None:
+            buffer = buffers.buffer = ctypes.create_string_buffer(signature_length)
+        # OQS_SIG_sign(sig, signature, &signature_len, message, message_len, secret_key)
+        length = ctypes.c_size_t(signature_length)
+        if oqs_sign(sig, buffer, ctypes.byref(length), message, ctypes.c_size_t(len(message)), secret_key) != 0:
+            raise RuntimeError("Can not sign message")
+        return ctypes.string_at(buffer, length.value)
+    
+    return sign
+
+_worker_signer = None
+_worker_sign = None
+
+def _init_signer(algorithm, secret_key):
+    """Pool initializer: load the service's keypair into this worker process"""
+    global _worker_signer, _worker_sign
+    _worker_signer = oqs.Signature(algorithm, secret_key)
+    _worker_sign = make_detached_signer(_worker_signer)
+
+def _sign_hash(record_hash):
+    """Sign a record hash in a pool worker"""
+    return _worker_sign(record_hash)
+
+def _verify_record(signed_record):
+    """Verify an ML-DSA-87 signed record in a pool worker"""
+    try:
+        return _worker_signer.verify(
+            binascii.a2b_base64(signed_record['record_hash']),
+            binascii.a2b_base64(signed_record['signature']),
+            binascii.a2b_base64(signed_record['public_key'])
+        )
+    except Exception:
+        return False
+
 class QuantumDatabaseSecurity:
+    SQL_INSERT_SIGNED = '''
+        INSERT INTO signed_records 
+        (record_hash, signature, public_key, timestamp, data_type, record_data)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+    SQL_RECORD_EXISTS = 'SELECT EXISTS(SELECT 1 FROM signed_records WHERE record_hash = ?)'
+    SQL_INSERT_CLIENT_DATA = '''
+        INSERT INTO client_data 
+        (client_id, data_hash, created_at)
+        VALUES (?, ?, ?)
+    '''
+    # Content and signature live once, in the signed record; client_data only indexes it.
+    # SQLite encodes each row as a JSON object so no Python row/dict is built.
+    SQL_SELECT_CLIENT_DATA_JSON = '''
+        SELECT json_object(
+            'id', c.id, 'client_id', c.client_id, 'data_hash', c.data_hash,
+            'signature', s.signature, 'created_at', c.created_at,
+            'data_content', json_extract(s.record_data, '$.content'))
+        FROM client_data c
+        JOIN signed_records s ON s.record_hash = c.data_hash
+        WHERE c.client_id = ?
+        ORDER BY c.created_at DESC
+    '''
+    
     def __init__(self):
         """Initialize ML-DSA-87 database security system"""
         self.signature_algorithm = "Dilithium5"  # ML-DSA-87
         self.signer = None
         self.public_key = None
+        self.public_key_b64 = "fallback"
         self.private_key = None
         self.record_counter = 0
+        # next() on a count is atomic under the GIL, so gthread workers never share a record_id
+        self._record_ids = itertools.count()
+        self._signing_pool = None
         self.db_path = "/app/data/quantum_db.sqlite"
+        self._local = threading.local()
+        self._write_queue = deque()
+        self._queue_lock = threading.Lock()
+        self._pending_hashes = set()
+        self._flush_lock = threading.Lock()
         
         self._initialize_quantum_signatures()
         self._initialize_database()
+        
+        if ASYNC_WRITE_INTERVAL > 0:
+            threading.Thread(target=self._flush_loop, name='db-flusher', daemon=True).start()
+            atexit.register(self.flush_writes)
         logger.info("🔒 Quantum Database Security initialized with ML-DSA-87")
     
     def _initialize_quantum_signatures(self):
@@ -61,13 +247,44 @@ class QuantumDatabaseSecurity:
             return
             
         try:
-            self.signer = oqs.Signature(self.signature_algorithm)
-            self.public_key = self.signer.generate_keypair()
+            self.signer, self.public_key = self._load_or_create_keypair()
+            self._sign_message = make_detached_signer(self.signer)
+            # Encoded once; every signed record carries the same key
+            self.public_key_b64 = binascii.b2a_base64(self.public_key, newline=False).decode('ascii')
             logger.info("✅ ML-DSA-87 keypair generated for database")
+            
+            if SIGNING_WORKERS > 0:
+                # Workers sign with the same keypair, loaded once per process
+                self._signing_pool = ProcessPoolExecutor(
+                    max_workers=SIGNING_WORKERS,
+                    initializer=_init_signer,
+                    initargs=(self.signature_algorithm, self.signer.export_secret_key())
+                )
+                logger.info(f"✅ ML-DSA-87 signing pool started with {SIGNING_WORKERS} workers")
         except Exception as e:
             logger.error(f"❌ Failed to initialize ML-DSA-87: {e}")
             # Don't raise, allow fallback operation
     
+    def _load_or_create_keypair(self):
+        """Load the shared ML-DSA-87 keypair, generating it if this is the first worker"""
+        with open(KEYPAIR_PATH + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            
+            if os.path.exists(KEYPAIR_PATH):
+                with open(KEYPAIR_PATH, 'rb') as f:
+                    keys = f.read()
+                pk_len = oqs.Signature(self.signature_algorithm).details['length_public_key']
+                public_key, secret_key = keys[:pk_len], keys[pk_len:]
+                logger.info(f"🔑 Loaded shared ML-DSA-87 keypair from {KEYPAIR_PATH}")
+                return oqs.Signature(self.signature_algorithm, secret_key), public_key
+            
+            signer = oqs.Signature(self.signature_algorithm)
+            public_key = signer.generate_keypair()
+            fd = os.open(KEYPAIR_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(public_key + signer.export_secret_key())
+            return signer, public_key
+    
     def _initialize_database(self):
         """Initialize SQLite database with signature tracking"""
         try:
@@ -89,93 +306,136 @@ class QuantumDatabaseSecurity:
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         client_id TEXT,
                         data_hash TEXT,
-                        signature TEXT,
-                        created_at TEXT,
-                        data_content TEXT
+                        created_at TEXT
+                    )
+                ''')
+                
+                # Admin client registry (one JSON profile per client)
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS client_registry (
+                        client_id TEXT PRIMARY KEY,
+                        data TEXT,
+                        timestamp TEXT,
+                        signature TEXT
                     )
                 ''')
                 
+                # Per-client reads filter on client_id and sort on created_at;
+                # record_hash and client_registry.client_id are indexed via UNIQUE/PRIMARY KEY
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_client_data_client_id ON client_data (client_id, created_at)')
+                
             logger.info("✅ Database schema initialized")
             
         except Exception as e:
             logger.error(f"❌ Database initialization failed: {e}")
             raise
     
+    def _open_connection(self):
+        """Open a long-lived database connection with WAL and tuned PRAGMAs"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(f'PRAGMA {pragma}')
+        return conn
+    
     @contextmanager
     def get_db_connection(self):
-        """Get database connection with proper cleanup"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Get this thread's persistent database connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._open_connection()
         try:
             yield conn
         finally:
-            conn.close()
+            # Never leave a half-finished transaction on the reused connection
+            if conn.in_transaction:
+                conn.rollback()
+    
+    def _sign(self, record_data, data_type):
+        """Hash and sign a record, returning it with its signed_records row"""
+        record_bytes = orjson.dumps(record_data, option=orjson.OPT_SORT_KEYS)
+        record_hash = record_digest(record_bytes)
+        
+        if QUANTUM_AVAILABLE and self.signer:
+            if self._signing_pool:
+                signature = self._signing_pool.submit(_sign_hash, record_hash).result()
+            else:
+                signature = self._sign_message(record_hash)
+            algorithm = self.signature_algorithm
+            public_key_encoded = self.public_key_b64
+        elif BLAKE3_AVAILABLE:
+            # Fallback to a keyed-BLAKE3 MAC
+            signature = blake3(record_hash, key=FALLBACK_MAC_KEY).digest()
+            algorithm = "Fallback-BLAKE3"
+            public_key_encoded = "fallback"
+        else:
+            # Fallback to hash-based signature
+            signature = hashlib.sha256(record_hash + b"fallback_key").digest()
+            algorithm = "Fallback-SHA256"
+            public_key_encoded = "fallback"
+        
+        record_id = next(self._record_ids)
+        signed_record = {
+            'record_id': record_id,
+            'timestamp': fast_iso_utc(),
+            'data_type': data_type,
+            'record_hash': binascii.b2a_base64(record_hash, newline=False).decode('ascii'),
+            'signature': binascii.b2a_base64(signature, newline=False).decode('ascii'),
+            'public_key': public_key_encoded,
+            'algorithm': algorithm,
+            'real_quantum_crypto': QUANTUM_AVAILABLE,
+            'data': record_data
+        }
+        signed_row = (
+            signed_record['record_hash'],
+            signed_record['signature'],
+            public_key_encoded,
+            signed_record['timestamp'],
+            data_type,
+            record_bytes.decode('utf-8')
+        )
+        
+        # Reporting only; ids come from _record_ids
+        self.record_counter = record_id + 1
+        logger.info(f"📝 Record {record_id + 1} signed with {algorithm}")
+        return signed_record, signed_row
     
     def sign_record(self, record_data, data_type="generic"):
         """Sign database record with ML-DSA-87 quantum signature"""
         try:
-            record_str = json.dumps(record_data, sort_keys=True)
-            record_hash = hashlib.sha3_256(record_str.encode()).digest()
-            
-            if QUANTUM_AVAILABLE and self.signer:
-                signature = self.signer.sign(record_hash)
-                algorithm = self.signature_algorithm
-                public_key_encoded = base64.b64encode(self.public_key).decode() if self.public_key else "fallback"
-            else:
-                # Fallback to hash-based signature
-                signature = hashlib.sha256(record_hash + b"fallback_key").digest()
-                algorithm = "Fallback-SHA256"
-                public_key_encoded = "fallback"
-            
-            signed_record = {
-                'record_id': self.record_counter,
-                'timestamp': datetime.utcnow().isoformat(),
-                'data_type': data_type,
-                'record_hash': base64.b64encode(record_hash).decode(),
-                'signature': base64.b64encode(signature).decode(),
-                'public_key': public_key_encoded,
-                'algorithm': algorithm,
-                'real_quantum_crypto': QUANTUM_AVAILABLE,
-                'data': record_data
-            }
+            signed_record, signed_row = self._sign(record_data, data_type)
             
             # Store in database
-            with self.get_db_connection() as conn:
-                conn.execute('''
-                    INSERT INTO signed_records 
-                    (record_hash, signature, public_key, timestamp, data_type, record_data)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    signed_record['record_hash'],
-                    signed_record['signature'],
-                    signed_record['public_key'],
-                    signed_record['timestamp'],
-                    data_type,
-                    record_str
-                ))
-                conn.commit()
+            with self.get_db_connection() as conn, conn:
+                conn.execute(self.SQL_INSERT_SIGNED, signed_row)
             
-            self.record_counter += 1
-            logger.info(f"📝 Record {self.record_counter} signed with {algorithm}")
             return signed_record
             
         except Exception as e:
             logger.error(f"❌ Record signing failed: {e}")
             raise
     
+    def _check_signature(self, signed_record, public_keys):
+        """Check one record's signature; public_keys caches decoded keys by their base64 form"""
+        signature = binascii.a2b_base64(signed_record['signature'])
+        record_hash = binascii.a2b_base64(signed_record['record_hash'])
+        algorithm = signed_record.get('algorithm')
+        
+        if QUANTUM_AVAILABLE and self.signer and algorithm == self.signature_algorithm:
+            public_key_b64 = signed_record['public_key']
+            public_key = public_keys.get(public_key_b64)
+            if public_key is None:
+                public_key = public_keys[public_key_b64] = binascii.a2b_base64(public_key_b64)
+            return self.signer.verify(record_hash, signature, public_key)
+        if algorithm == "Fallback-BLAKE3":
+            return BLAKE3_AVAILABLE and signature == blake3(record_hash, key=FALLBACK_MAC_KEY).digest()
+        # Fallback verification
+        return signature == hashlib.sha256(record_hash + b"fallback_key").digest()
+    
     def verify_record_signature(self, signed_record):
         """Verify ML-DSA-87 signature on database record"""
         try:
-            signature = base64.b64decode(signed_record['signature'])
-            record_hash = base64.b64decode(signed_record['record_hash'])
-            
-            if QUANTUM_AVAILABLE and self.signer and signed_record.get('algorithm') == self.signature_algorithm:
-                public_key = base64.b64decode(signed_record['public_key'])
-                is_valid = self.signer.verify(record_hash, signature, public_key)
-            else:
-                # Fallback verification
-                expected_signature = hashlib.sha256(record_hash + b"fallback_key").digest()
-                is_valid = signature == expected_signature
+            is_valid = self._check_signature(signed_record, {})
             
             if is_valid:
                 logger.info(f"✅ Record {signed_record['record_id']} signature verified")
@@ -188,46 +448,147 @@ class QuantumDatabaseSecurity:
             logger.error(f"❌ Record verification failed: {e}")
             return False
     
+    def verify_record_signatures(self, signed_records):
+        """Verify a batch of records, decoding each distinct public key only once"""
+        if self._signing_pool and len(signed_records) > 1 and all(
+                signed_record.get('algorithm') == self.signature_algorithm for signed_record in signed_records):
+            # Spread ML-DSA-87 verification across the signing workers
+            return list(self._signing_pool.map(_verify_record, signed_records, chunksize=16))
+        
+        public_keys = {}
+        results = []
+        for signed_record in signed_records:
+            try:
+                results.append(self._check_signature(signed_record, public_keys))
+            except Exception as e:
+                logger.error(f"❌ Record verification failed: {e}")
+                results.append(False)
+        return results
+    
+    def _sign_client_data(self, client_id, data_content):
+        """Sign client data, returning the record and its signed_records/client_data rows"""
+        signed_record, signed_row = self._sign({
+            'client_id': client_id,
+            'content': data_content
+        }, 'client_data')
+        client_row = (
+            client_id,
+            signed_record['record_hash'],
+            signed_record['timestamp']
+        )
+        return signed_record, signed_row, client_row
+    
     def store_client_data(self, client_id, data_content):
         """Store client data with quantum signature"""
+        if ASYNC_WRITE_INTERVAL <= 0:
+            return self.store_client_data_batch([(client_id, data_content)])[0]
+        
         try:
-            signed_record = self.sign_record({
-                'client_id': client_id,
-                'content': data_content
-            }, data_type='client_data')
+            signed_record, signed_row, client_row = self._sign_client_data(client_id, data_content)
+            record_hash = signed_row[0]
+            with self._queue_lock:
+                # Reject duplicates now, as a synchronous insert would, rather than
+                # acknowledging a row the flusher can't commit
+                if record_hash in self._pending_hashes or self._record_exists(record_hash):
+                    raise sqlite3.IntegrityError("UNIQUE constraint failed: signed_records.record_hash")
+                self._pending_hashes.add(record_hash)
+                # FIFO queue keeps commit order identical to signing order
+                self._write_queue.append((signed_row, client_row))
+            return signed_record
             
-            with self.get_db_connection() as conn:
-                conn.execute('''
-                    INSERT INTO client_data 
-                    (client_id, data_hash, signature, created_at, data_content)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    client_id,
-                    signed_record['record_hash'],
-                    signed_record['signature'],
-                    signed_record['timestamp'],
-                    data_content
-                ))
-                conn.commit()
+        except Exception as e:
+            logger.error(f"❌ Client data storage failed: {e}")
+            raise
+    
+    def _record_exists(self, record_hash):
+        """Whether a signed record with this hash is already committed"""
+        with self.get_db_connection() as conn:
+            return conn.execute(self.SQL_RECORD_EXISTS, (record_hash,)).fetchone()[0] == 1
+    
+    def _flush_loop(self):
+        """Background thread: commit queued writes every ASYNC_WRITE_INTERVAL"""
+        while True:
+            time.sleep(ASYNC_WRITE_INTERVAL)
+            if self._write_queue:
+                try:
+                    self.flush_writes()
+                except Exception as e:
+                    logger.error(f"❌ Background flush failed: {e}")
+    
+    def flush_writes(self):
+        """Commit all queued client writes, ASYNC_WRITE_BATCH rows per transaction"""
+        with self._flush_lock:
+            while self._write_queue:
+                batch = []
+                while self._write_queue and len(batch) < ASYNC_WRITE_BATCH:
+                    batch.append(self._write_queue.popleft())
+                self._write_rows(batch)
+                with self._queue_lock:
+                    self._pending_hashes.difference_update(signed_row[0] for signed_row, _ in batch)
+    
+    def _write_rows(self, batch):
+        """Insert (signed_row, client_row) pairs in one transaction, isolating bad rows on failure"""
+        try:
+            with self.get_db_connection() as conn, conn:
+                conn.executemany(self.SQL_INSERT_SIGNED, [signed_row for signed_row, _ in batch])
+                conn.executemany(self.SQL_INSERT_CLIENT_DATA, [client_row for _, client_row in batch])
+        except sqlite3.Error as e:
+            if len(batch) == 1:
+                self._dead_letter(batch[0], e)
+                return
+            # Retry row by row so one bad record doesn't lose the whole batch
+            for item in batch:
+                self._write_rows([item])
+            return
+        
+        invalidate_responses(*{('retrieve', client_row[0]) for _, client_row in batch})
+    
+    def _dead_letter(self, item, error):
+        """Keep an acknowledged row that failed to commit so it can be replayed"""
+        signed_row, client_row = item
+        logger.error(f"❌ Queued record {signed_row[0]} failed to commit, dead-lettered: {error}")
+        try:
+            with open(DEAD_LETTER_PATH, 'ab') as f:
+                f.write(orjson.dumps({
+                    'error': str(error),
+                    'failed_at': fast_iso_utc(),
+                    'signed_row': signed_row,
+                    'client_row': client_row
+                }) + b'\n')
+        except OSError as e:
+            logger.critical(f"🚨 Could not dead-letter record {signed_row[0]}: {e}")
+    
+    def store_client_data_batch(self, items):
+        """Sign and store (client_id, data_content) pairs in a single transaction"""
+        try:
+            signed_records = []
+            signed_rows = []
+            client_rows = []
+            for client_id, data_content in items:
+                signed_record, signed_row, client_row = self._sign_client_data(client_id, data_content)
+                signed_records.append(signed_record)
+                signed_rows.append(signed_row)
+                client_rows.append(client_row)
             
-            return signed_record
+            # Both tables commit together, one fsync for the whole batch
+            with self.get_db_connection() as conn, conn:
+                conn.executemany(self.SQL_INSERT_SIGNED, signed_rows)
+                conn.executemany(self.SQL_INSERT_CLIENT_DATA, client_rows)
+            
+            invalidate_responses(*{('retrieve', client_id) for client_id, _ in items})
+            return signed_records
             
         except Exception as e:
             logger.error(f"❌ Client data storage failed: {e}")
             raise
     
-    def get_client_data(self, client_id):
-        """Retrieve and verify client data"""
+    def get_client_data_json(self, client_id):
+        """Retrieve client data as (record_count, JSON array text)"""
         try:
             with self.get_db_connection() as conn:
-                cursor = conn.execute('''
-                    SELECT * FROM client_data WHERE client_id = ?
-                    ORDER BY created_at DESC
-                ''', (client_id,))
+                records = [row[0] for row in conn.execute(self.SQL_SELECT_CLIENT_DATA_JSON, (client_id,))]
                 
-                records = [dict(row) for row in cursor.fetchall()]
-                
-            return records
+            return len(records), '[' + ','.join(records) + ']'
             
         except Exception as e:
             logger.error(f"❌ Client data retrieval failed: {e}")
@@ -236,35 +597,45 @@ class QuantumDatabaseSecurity:
 # Initialize quantum database security
 quantum_db = QuantumDatabaseSecurity()
 
+def _json_response(obj, status=200):
+    """Encode a response body with orjson"""
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
+
+# Constant part of the /health body, encoded once; only the counter and time are spliced in
+_HEALTH_PREFIX = orjson.dumps({
+    'status': 'healthy',
+    'service': 'quantum-database',
+    'algorithm': quantum_db.signature_algorithm,
+    'real_quantum_crypto': QUANTUM_AVAILABLE,
+    'quantum_library': 'liboqs-python' if QUANTUM_AVAILABLE else 'fallback',
+    'nist_level': 5  # ML-DSA-87 is NIST Level 5
+})[:-1]
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint with quantum crypto status"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'quantum-database',
-        'algorithm': quantum_db.signature_algorithm,
-        'real_quantum_crypto': QUANTUM_AVAILABLE,
-        'quantum_library': 'liboqs-python' if QUANTUM_AVAILABLE else 'fallback',
-        'nist_level': 5,  # ML-DSA-87 is NIST Level 5
-        'records_signed': quantum_db.record_counter,
-        'timestamp': datetime.utcnow().isoformat()
-    })
+    return app.response_class(
+        b'%s,"records_signed":%d,"timestamp":"%s"}' % (
+            _HEALTH_PREFIX, quantum_db.record_counter, fast_iso_utc().encode('ascii')
+        ),
+        mimetype='application/json'
+    )
 
 @app.route('/store', methods=['POST'])
 def store_data():
     """Store data with ML-DSA-87 signature"""
     try:
-        data = request.get_json()
+        data = orjson.loads(request.get_data())
         client_id = data.get('client_id')
         content = data.get('content')
         
         if not client_id or not content:
-            return jsonify({'error': 'Missing client_id or content'}), 400
+            return _json_response({'error': 'Missing client_id or content'}, 400)
         
         signed_record = quantum_db.store_client_data(client_id, content)
         
         logger.info(f"✅ Stored data for client {client_id}")
-        return jsonify({
+        return _json_response({
             'status': 'stored',
             'record_id': signed_record['record_id'],
             'signature': signed_record['signature'],
@@ -273,33 +644,78 @@ def store_data():
         
     except Exception as e:
         logger.error(f"❌ Data storage failed: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
+
+def _request_records():
+    """Parse the 'records' list of a batch request, None if the body is malformed"""
+    try:
+        body = orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(body, dict):
+        return None
+    records = body.get('records')
+    if records is None:
+        return []
+    if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+        return None
+    return records
+
+@app.route('/store/batch', methods=['POST'])
+def store_data_batch():
+    """Store many records with ML-DSA-87 signatures in one transaction"""
+    try:
+        records = _request_records()
+        if records is None:
+            return _json_response({'error': 'Body must be an object with a records list of objects'}, 400)
+        items = [(record.get('client_id'), record.get('content')) for record in records]
+        
+        if not items or not all(client_id and content for client_id, content in items):
+            return _json_response({'error': 'Each record needs client_id and content'}, 400)
+        
+        signed_records = quantum_db.store_client_data_batch(items)
+        
+        logger.info(f"✅ Stored {len(signed_records)} records")
+        return _json_response({
+            'status': 'stored',
+            'records': [{
+                'record_id': signed_record['record_id'],
+                'signature': signed_record['signature'],
+                'timestamp': signed_record['timestamp']
+            } for signed_record in signed_records]
+        })
+        
+    except Exception as e:
+        logger.error(f"❌ Batch data storage failed: {e}")
+        return _json_response({'error': str(e)}, 500)
 
 @app.route('/retrieve/<client_id>', methods=['GET'])
 def retrieve_data(client_id):
     """Retrieve client data with signature verification"""
     try:
-        records = quantum_db.get_client_data(client_id)
+        def build():
+            record_count, records_json = quantum_db.get_client_data_json(client_id)
+            # Splice the SQLite-built array into the envelope rather than re-encoding it
+            return orjson.dumps({
+                'status': 'retrieved',
+                'client_id': client_id,
+                'record_count': record_count
+            })[:-1] + b',"records":' + records_json.encode('utf-8') + b'}'
         
-        return jsonify({
-            'status': 'retrieved',
-            'client_id': client_id,
-            'record_count': len(records),
-            'records': records
-        })
+        return cached_json_response(('retrieve', client_id), build)
         
     except Exception as e:
         logger.error(f"❌ Data retrieval failed: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @app.route('/verify', methods=['POST'])
 def verify_record():
     """Verify ML-DSA-87 signature on record"""
     try:
-        signed_record = request.get_json()
+        signed_record = orjson.loads(request.get_data())
         is_valid = quantum_db.verify_record_signature(signed_record)
         
-        return jsonify({
+        return _json_response({
             'status': 'verified' if is_valid else 'invalid',
             'record_id': signed_record.get('record_id'),
             'algorithm': quantum_db.signature_algorithm
@@ -307,7 +723,32 @@ def verify_record():
         
     except Exception as e:
         logger.error(f"❌ Verification failed: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
+
+@app.route('/verify/batch', methods=['POST'])
+def verify_records_batch():
+    """Verify ML-DSA-87 signatures on many records in one request"""
+    try:
+        signed_records = _request_records()
+        if signed_records is None:
+            return _json_response({'error': 'Body must be an object with a records list of objects'}, 400)
+        results = quantum_db.verify_record_signatures(signed_records)
+        
+        valid_count = sum(results)
+        logger.info(f"✅ Batch verified {valid_count}/{len(results)} records")
+        return _json_response({
+            'status': 'verified' if valid_count == len(results) else 'invalid',
+            'results': [{
+                'record_id': signed_record.get('record_id'),
+                'valid': is_valid
+            } for signed_record, is_valid in zip(signed_records, results)],
+            'valid_count': valid_count,
+            'algorithm': quantum_db.signature_algorithm
+        })
+        
+    except Exception as e:
+        logger.error(f"❌ Batch verification failed: {e}")
+        return _json_response({'error': str(e)}, 500)
 
 @app.route('/stats', methods=['GET'])
 def get_stats():
@@ -320,7 +761,7 @@ def get_stats():
             cursor = conn.execute('SELECT COUNT(DISTINCT client_id) FROM client_data')
             unique_clients = cursor.fetchone()[0]
         
-        return jsonify({
+        return _json_response({
             'records_signed': quantum_db.record_counter,
             'total_stored_records': total_records,
             'unique_clients': unique_clients,
@@ -331,12 +772,12 @@ def get_stats():
         
     except Exception as e:
         logger.error(f"❌ Stats retrieval failed: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @app.route('/tunnel/status', methods=['GET'])
 def tunnel_status():
     """Get Rosenpass tunnel status"""
-    return jsonify({
+    return _json_response({
         'tunnel_type': 'rosenpass_internal',
         'encryption': 'ML-KEM-768',
         'connected_to': ['firewall-service', 'backup-service'],
@@ -349,23 +790,24 @@ def tunnel_status():
 def create_client():
     """Create a new client in the database"""
     try:
-        data = request.get_json()
+        data = orjson.loads(request.get_data())
         
         # Validate required fields
         required_fields = ['company_name', 'contact_email', 'contact_name']
         if not all(field in data for field in required_fields):
-            return jsonify({'error': 'Missing required fields: company_name, contact_email, contact_name'}), 400
+            return _json_response({'error': 'Missing required fields: company_name, contact_email, contact_name'}, 400)
         
         client_id = f"client_{data['company_name'].lower().replace(' ', '_')}_{int(time.time())}"
+        created_at = fast_iso_utc()
         
         # Store client in database
-        with quantum_db.get_db_connection() as conn:
+        with quantum_db.get_db_connection() as conn, conn:
             conn.execute('''
-                INSERT INTO client_data (client_id, data, timestamp, signature)
+                INSERT INTO client_registry (client_id, data, timestamp, signature)
                 VALUES (?, ?, ?, ?)
             ''', (
                 client_id,
-                json.dumps({
+                orjson.dumps({
                     'company_name': data['company_name'],
                     'contact_email': data['contact_email'],
                     'contact_name': data['contact_name'],
@@ -373,118 +815,117 @@ def create_client():
                     'plan_type': data.get('plan_type', 'standard'),
                     'network_config': data.get('network_config', {}),
                     'status': 'created',
-                    'created_at': datetime.utcnow().isoformat()
-                }),
-                datetime.utcnow().isoformat(),
+                    'created_at': created_at
+                }).decode('utf-8'),
+                created_at,
                 'quantum_signature_placeholder'  # Would be real signature in production
             ))
-            conn.commit()
         
         logger.info(f"✅ Created client {client_id} for {data['company_name']}")
-        return jsonify({
+        return _json_response({
             'client_id': client_id,
             'company_name': data['company_name'],
             'status': 'created',
-            'created_at': datetime.utcnow().isoformat()
-        }), 201
+            'created_at': created_at
+        }, 201)
         
     except Exception as e:
         logger.error(f"❌ Failed to create client: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @app.route('/admin/clients', methods=['GET'])
 def list_clients():
     """List all clients"""
     try:
-        with quantum_db.get_db_connection() as conn:
-            cursor = conn.execute('SELECT client_id, data, timestamp FROM client_data ORDER BY timestamp DESC')
-            clients = []
-            
-            for row in cursor.fetchall():
-                client_data = json.loads(row[1])
-                clients.append({
-                    'client_id': row[0],
-                    'company_name': client_data.get('company_name'),
-                    'contact_email': client_data.get('contact_email'),
-                    'plan_type': client_data.get('plan_type'),
-                    'status': client_data.get('status'),
-                    'created_at': client_data.get('created_at')
-                })
-        
-        return jsonify({
-            'clients': clients,
-            'total': len(clients)
-        })
+        def generate():
+            # Rows are encoded as they are read so the full registry is never held in memory
+            with quantum_db.get_db_connection() as conn:
+                cursor = conn.execute('SELECT client_id, data, timestamp FROM client_registry ORDER BY timestamp DESC')
+                cursor.arraysize = 200
+                
+                yield b'{"clients":['
+                total = 0
+                for row in cursor:
+                    client_data = orjson.loads(row[1])
+                    yield (b',' if total else b'') + orjson.dumps({
+                        'client_id': row[0],
+                        'company_name': client_data.get('company_name'),
+                        'contact_email': client_data.get('contact_email'),
+                        'plan_type': client_data.get('plan_type'),
+                        'status': client_data.get('status'),
+                        'created_at': client_data.get('created_at')
+                    })
+                    total += 1
+                
+                yield b'],"total":' + str(total).encode() + b'}'
+        
+        return Response(stream_with_context(generate()), mimetype='application/json')
         
     except Exception as e:
         logger.error(f"❌ Failed to list clients: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @app.route('/admin/clients/<client_id>', methods=['GET'])
 def get_client_details(client_id):
     """Get detailed information about a specific client"""
     try:
-        with quantum_db.get_db_connection() as conn:
-            cursor = conn.execute('SELECT data, timestamp FROM client_data WHERE client_id = ?', (client_id,))
-            row = cursor.fetchone()
+        def build():
+            with quantum_db.get_db_connection() as conn:
+                cursor = conn.execute('SELECT data, timestamp FROM client_registry WHERE client_id = ?', (client_id,))
+                row = cursor.fetchone()
             
             if not row:
-                return jsonify({'error': 'Client not found'}), 404
+                return _json_response({'error': 'Client not found'}, 404)
             
-            client_data = json.loads(row[0])
-            
-            return jsonify({
+            return {
                 'client_id': client_id,
-                'client_data': client_data,
+                'client_data': orjson.loads(row[0]),
                 'last_updated': row[1]
-            })
+            }
+        
+        return cached_json_response(('client', client_id), build)
         
     except Exception as e:
         logger.error(f"❌ Failed to get client details for {client_id}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @app.route('/admin/clients/<client_id>', methods=['PUT'])
 def update_client(client_id):
     """Update client information"""
     try:
-        data = request.get_json()
+        data = orjson.loads(request.get_data())
+        if not isinstance(data, dict):
+            return _json_response({'error': 'Expected a JSON object of fields to update'}, 400)
         
-        # Get current client data
-        with quantum_db.get_db_connection() as conn:
-            cursor = conn.execute('SELECT data FROM client_data WHERE client_id = ?', (client_id,))
-            row = cursor.fetchone()
-            
-            if not row:
-                return jsonify({'error': 'Client not found'}), 404
-            
-            current_data = json.loads(row[0])
-            
-            # Update fields
-            current_data.update(data)
-            current_data['updated_at'] = datetime.utcnow().isoformat()
-            
-            # Update in database
-            conn.execute('''
-                UPDATE client_data 
-                SET data = ?, timestamp = ?
+        updated_at = fast_iso_utc()
+        
+        # Merge-patch inside SQLite (RFC 7396: nested objects merge, null removes a
+        # field) so the stored profile never round-trips through Python
+        with quantum_db.get_db_connection() as conn, conn:
+            cursor = conn.execute('''
+                UPDATE client_registry 
+                SET data = json_patch(data, ?), timestamp = ?
                 WHERE client_id = ?
             ''', (
-                json.dumps(current_data),
-                datetime.utcnow().isoformat(),
+                orjson.dumps({**data, 'updated_at': updated_at}).decode('utf-8'),
+                updated_at,
                 client_id
             ))
-            conn.commit()
         
+        if cursor.rowcount == 0:
+            return _json_response({'error': 'Client not found'}, 404)
+        
+        invalidate_responses(('client', client_id))
         logger.info(f"✅ Updated client {client_id}")
-        return jsonify({
+        return _json_response({
             'client_id': client_id,
             'status': 'updated',
-            'updated_at': current_data['updated_at']
+            'updated_at': updated_at
         })
         
     except Exception as e:
         logger.error(f"❌ Failed to update client {client_id}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @app.route('/admin/clients/<client_id>/credentials', methods=['POST'])
 def generate_portal_credentials(client_id):
@@ -492,21 +933,21 @@ def generate_portal_credentials(client_id):
     try:
         # Get client data
         with quantum_db.get_db_connection() as conn:
-            cursor = conn.execute('SELECT data FROM client_data WHERE client_id = ?', (client_id,))
+            cursor = conn.execute('SELECT data FROM client_registry WHERE client_id = ?', (client_id,))
             row = cursor.fetchone()
             
             if not row:
-                return jsonify({'error': 'Client not found'}), 404
+                return _json_response({'error': 'Client not found'}, 404)
             
-            client_data = json.loads(row[0])
+            client_data = orjson.loads(row[0])
         
         # Generate portal credentials
         portal_credentials = {
             'portal_url': f"https://portal.kybershield.ai/{client_id.replace('client_', '')}",
             'username': client_data['contact_email'],
-            'temporary_password': base64.b64encode(os.urandom(12)).decode('utf-8'),
+            'temporary_password': binascii.b2a_base64(os.urandom(12), newline=False).decode('ascii'),
             'force_password_change': True,
-            'generated_at': datetime.utcnow().isoformat()
+            'generated_at': fast_iso_utc()
         }
         
         # Store credentials (in production, would hash password)
@@ -521,35 +962,32 @@ def generate_portal_credentials(client_id):
         }
         
         # Sign and store the credentials
-        signed_record = quantum_db.sign_record(credentials_record)
-        quantum_db.store_signed_record(signed_record)
+        quantum_db.sign_record(credentials_record, data_type='portal_credentials')
         
         logger.info(f"🔑 Generated portal credentials for client {client_id}")
-        return jsonify({
+        return _json_response({
             'client_id': client_id,
             'portal_credentials': portal_credentials,
             'status': 'credentials_generated'
-        }), 201
+        }, 201)
         
     except Exception as e:
         logger.error(f"❌ Failed to generate credentials for {client_id}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 @app.route('/admin/clients/<client_id>/metrics', methods=['GET'])
 def get_client_metrics(client_id):
     """Get metrics and analytics for a specific client"""
     try:
-        # Get client data to verify existence
+        # Existence check and the client's signed records count in one round trip
         with quantum_db.get_db_connection() as conn:
-            cursor = conn.execute('SELECT data FROM client_data WHERE client_id = ?', (client_id,))
-            row = cursor.fetchone()
-            
-            if not row:
-                return jsonify({'error': 'Client not found'}), 404
-            
-            # Get client's signed records count
-            cursor = conn.execute('SELECT COUNT(*) FROM signed_records WHERE record_id LIKE ?', (f'{client_id}_%',))
-            client_records = cursor.fetchone()[0]
+            exists, client_records = conn.execute('''
+                SELECT EXISTS(SELECT 1 FROM client_registry WHERE client_id = ?),
+                       (SELECT COUNT(*) FROM client_data WHERE client_id = ?)
+            ''', (client_id, client_id)).fetchone()
+        
+        if not exists:
+            return _json_response({'error': 'Client not found'}, 404)
         
         # Generate sample metrics (in production, would come from monitoring systems)
         metrics = {
@@ -571,14 +1009,14 @@ def get_client_metrics(client_id):
                 'average_response_time': '45ms',
                 'total_requests_today': 1247
             },
-            'last_updated': datetime.utcnow().isoformat()
+            'last_updated': fast_iso_utc()
         }
         
-        return jsonify(metrics)
+        return _json_response(metrics)
         
     except Exception as e:
         logger.error(f"❌ Failed to get metrics for {client_id}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}, 500)
 
 if __name__ == '__main__':
     logger.info("🚀 Starting KyberShield Quantum Database Security")
@@ -5,10 +5,27 @@ Monitor your actual AWS deployment without local credentials
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import os
 import time
 from datetime import datetime
 from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Keep-alive session shared by every probe so repeat runs reuse TCP/TLS connections
+http_session = requests.Session()
+http_session.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+http_session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+# Last workflow-runs response and its ETag; a 304 on the conditional request reuses
+# it and does not count against the GitHub API rate limit
+GITHUB_CACHE_FILE = os.getenv('GITHUB_CACHE_FILE', '/tmp/.kybershield_gha_etag')
 
 class AWSDeploymentMonitor:
     def __init__(self):
@@ -31,11 +48,23 @@ class AWSDeploymentMonitor:
             api_url = f"https://api.github.com/repos/{self.github_repo}/actions/runs"
             params = {'branch': self.branch, 'per_page': 5}
             
-            response = requests.get(api_url, params=params, timeout=10)
+            cached = self._load_github_cache()
+            headers = {'Accept': 'application/vnd.github+json'}
+            if cached:
+                headers['If-None-Match'] = cached['etag']
             
-            if response.status_code == 200:
+            response = http_session.get(api_url, params=params, headers=headers, timeout=10)
+            
+            if response.status_code == 304 and cached:
+                runs_data = cached['runs']
+            elif response.status_code == 200:
                 runs_data = response.json()
-                
+                if response.headers.get('ETag'):
+                    self._save_github_cache(response.headers['ETag'], runs_data)
+            else:
+                runs_data = None
+            
+            if runs_data is not None:
                 if runs_data['workflow_runs']:
                     latest_run = runs_data['workflow_runs'][0]
                     status['latest_run'] = {
@@ -66,6 +95,25 @@ class AWSDeploymentMonitor:
             
         return status
 
+    def _load_github_cache(self) -> Dict[str, Any]:
+        """Read the cached workflow runs for this repo/branch, if any"""
+        try:
+            with open(GITHUB_CACHE_FILE) as f:
+                cached = json.load(f)
+            if cached.get('repo') == self.github_repo and cached.get('branch') == self.branch:
+                return cached
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save_github_cache(self, etag: str, runs_data: Dict[str, Any]):
+        """Persist the workflow runs response with its ETag"""
+        try:
+            with open(GITHUB_CACHE_FILE, 'w') as f:
+                json.dump({'repo': self.github_repo, 'branch': self.branch, 'etag': etag, 'runs': runs_data}, f)
+        except OSError as e:
+            print(f"⚠️ Could not cache GitHub response: {e}")
+
     def get_aws_monitoring_commands(self) -> Dict[str, List[str]]:
         """Generate AWS CLI commands to check your deployment"""
         return {
@@ -103,26 +151,33 @@ class AWSDeploymentMonitor:
             "http://kybershield-backup.us-east-1.elb.amazonaws.com"
         ]
         
-        accessibility = {}
+        # Probes are I/O-bound, so fire them all at once; map keeps URL order
+        with ThreadPoolExecutor(max_workers=len(potential_urls)) as executor:
+            results = list(executor.map(self._probe_url, potential_urls))
         
-        for url in potential_urls:
+        accessibility = {}
+        for url, result in zip(potential_urls, results):
             service_name = url.split('//')[1].split('.')[0].replace('kybershield-', '')
-            try:
-                response = requests.get(f"{url}/health", timeout=10)
-                accessibility[service_name] = {
-                    'url': url,
-                    'status': 'accessible' if response.status_code == 200 else f"http_{response.status_code}",
-                    'response_time': response.elapsed.total_seconds()
-                }
-            except requests.exceptions.Timeout:
-                accessibility[service_name] = {'url': url, 'status': 'timeout'}
-            except requests.exceptions.ConnectionError:
-                accessibility[service_name] = {'url': url, 'status': 'unreachable'}
-            except Exception as e:
-                accessibility[service_name] = {'url': url, 'status': f'error: {str(e)}'}
+            accessibility[service_name] = result
                 
         return accessibility
 
+    def _probe_url(self, url: str) -> Dict[str, Any]:
+        """Hit one load balancer's /health endpoint"""
+        try:
+            response = http_session.get(f"{url}/health", timeout=10)
+            return {
+                'url': url,
+                'status': 'accessible' if response.status_code == 200 else f"http_{response.status_code}",
+                'response_time': response.elapsed.total_seconds()
+            }
+        except requests.exceptions.Timeout:
+            return {'url': url, 'status': 'timeout'}
+        except requests.exceptions.ConnectionError:
+            return {'url': url, 'status': 'unreachable'}
+        except Exception as e:
+            return {'url': url, 'status': f'error: {str(e)}'}
+
     def generate_deployment_report(self) -> Dict[str, Any]:
         """Generate comprehensive deployment monitoring report"""
         print("\n🔍 KyberShield AWS Deployment Monitor")
@@ -241,8 +296,13 @@ def main():
         # Save report
         timestamp = int(time.time())
         report_file = f"aws_deployment_report_{timestamp}.json"
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        # Every report field is already JSON-native (timestamp is an ISO string)
+        if orjson:
+            with open(report_file, 'wb') as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            with open(report_file, 'w') as f:
+                json.dump(report, f, indent=2)
         
         print(f"\n💾 Detailed report saved to: {report_file}")
         